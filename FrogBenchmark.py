@@ -0,0 +1,6 @@
+# Kept so existing commands and imports keep working; the code lives in froggycalc.benchmark
+from froggycalc.benchmark import *  # noqa: F401,F403
+from froggycalc.benchmark import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# Kept so existing commands and imports keep working; the code lives in froggycalc.exact
+from froggycalc.exact import *  # noqa: F401,F403
+from froggycalc.exact import main
+
+if __name__ == "__main__":
+    main()
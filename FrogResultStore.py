@@ -0,0 +1,6 @@
+# Kept so existing commands and imports keep working; the code lives in froggycalc.store
+from froggycalc.store import *  # noqa: F401,F403
+from froggycalc.store import main
+
+if __name__ == "__main__":
+    main()
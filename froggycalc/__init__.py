@@ -0,0 +1,14 @@
+"""Pocket Frogs breeding calculator
+
+Submodules are imported on demand so that quick lookups do not pay for numba or pandas:
+
+    froggycalc.palette        palettes and color wheels (numpy only)
+    froggycalc.stats          mergeable summary statistics (numpy only)
+    froggycalc.rng            counter-based random streams shared by every engine (numpy only)
+    froggycalc.curve          collection completion curves (numpy only)
+    froggycalc.exact          exact breed count distributions
+    froggycalc.numba_engine   compiled parallel simulation (numba)
+    froggycalc.pandas_engine  the original pandas simulation (pandas)
+"""
+
+__version__ = "0.3.0"
@@ -0,0 +1,3 @@
+from froggycalc.cli import main
+
+main()
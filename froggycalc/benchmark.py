@@ -0,0 +1,265 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from froggycalc.palette import load_palette, synthetic_palette
+
+
+def numba_engine(strategy, threads, palette, seed):
+    """Return a run(n) callable for the parallel numba engine"""
+    import numba
+    from froggycalc.numba_engine import create_frog_table, run_trials, warm_up
+
+    numba.set_num_threads(threads)
+    base_frog_table = create_frog_table(palette)
+    warm_up([strategy])
+    return lambda n: run_trials(strategy, n, base_frog_table, seed=seed, palette=palette)
+
+
+def numpy_engine(strategy, threads, palette, seed):
+    """Return a run(n) callable for the lockstep NumPy engine (always single threaded)"""
+    from froggycalc.numpy_engine import create_frog_table, run_trials
+
+    base_frog_table = create_frog_table(palette)
+    return lambda n: run_trials(strategy, n, base_frog_table, seed=seed, palette=palette)
+
+
+def pandas_engine(strategy, threads, palette, seed):
+    """Return a run(n) callable for the original pandas engine (always single threaded)"""
+    from froggycalc import pandas_engine as pandas_module
+    from froggycalc.rng import trial_codes
+
+    base_frog_table = pandas_module.create_frog_table(palette)
+    strategy_fn = getattr(pandas_module, strategy)
+    return lambda n: np.array([strategy_fn(base_frog_table.copy(), palette.color_wheel, trial_codes(seed, i))
+                               for i in range(n)])
+
+
+# Engine name -> factory(strategy, threads, palette, seed) returning run(n) -> per-trial breed counts of the
+# first n trials of seed
+ENGINES = {
+    "numba": numba_engine,
+    "numpy": numpy_engine,
+    "pandas": pandas_engine,
+}
+
+# Engines whose speed does not depend on the thread count
+SINGLE_THREADED_ENGINES = {"numpy", "pandas"}
+
+
+def engine_strategies(engine):
+    """Names of the strategies an engine can run"""
+    if engine == "numba":
+        from froggycalc.numba_engine import STRATEGIES
+        return list(STRATEGIES)
+    if engine == "numpy":
+        from froggycalc.numpy_engine import COUNT_RULES
+        return list(COUNT_RULES)
+    # The pandas engine's strategy functions, listed here so that checking them does not import pandas
+    return ["strategy_1", "strategy_2"]
+
+
+def breeds_performed(engine, strategy, n, palette, seed):
+    """Total breeds performed (counted or not) by the first n trials of seed, which every engine draws alike
+
+    The numba engine reads them off the last arrival of the strategy's completion curve. The other
+    engines only run pair schedule strategies, which all perform the breeds strategy 1 counts.
+    """
+    if engine == "numba":
+        from froggycalc.numba_engine import create_frog_table, run_curve
+
+        curve = run_curve(strategy, n, create_frog_table(palette), bin_width=1, n_bins=1, seed=seed, palette=palette)
+        return int(curve.breed_sums[-1]) if len(curve.breed_sums) else 0
+    return int(ENGINES[engine]("strategy_1", 1, palette, seed)(n).sum())
+
+
+def benchmark(engine, strategy, n, threads, repeats, palette=None, seed=0):
+    """Time repeats runs of the same n trials after a warm-up, returning one JSON-ready result record"""
+    if palette is None:
+        palette = load_palette()
+    start_time = time.perf_counter()
+    run = ENGINES[engine](strategy, threads, palette, seed)
+    run(1)
+    warm_up_time = time.perf_counter() - start_time
+
+    times = []
+    breeds = 0
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        results = run(n)
+        times.append(time.perf_counter() - start_time)
+        breeds = int(results.sum())
+
+    best = min(times)
+    # Counted outside the timed runs, since only the completion curve kernels see every breed
+    performed = breeds_performed(engine, strategy, n, palette, seed)
+    return {
+        "engine": engine,
+        "strategy": strategy,
+        "palette": palette.name,
+        "target_count": palette.target_count,
+        "trials": n,
+        "threads": threads,
+        "repeats": repeats,
+        "warm_up_seconds": warm_up_time,
+        "times_seconds": times,
+        "best_seconds": best,
+        "median_seconds": float(np.median(times)),
+        "trials_per_sec": n / best,
+        # Breeding throughput: every breed the runs performed. Strategy 2 performs the same breeds as
+        # strategy 1 but counts fewer of them, which counted_breeds_per_sec reflects.
+        "breeds_per_sec": performed / best,
+        "counted_breeds_per_sec": breeds / best,
+    }
+
+
+# Modules whose cold import time is measured, in the order the CLI commands need them
+IMPORT_TIME_MODULES = (
+    "froggycalc.cli", "froggycalc.palette", "froggycalc.exact", "froggycalc.numpy_engine", "froggycalc.numba_engine",
+    "froggycalc.pandas_engine",
+)
+
+
+def import_time(module=None, repeats=5):
+    """Best wall time of a fresh interpreter importing module (or doing nothing when module is None), in seconds"""
+    code = "pass" if module is None else f"import {module}"
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_parent, os.environ.get("PYTHONPATH")])))
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def import_times(modules=IMPORT_TIME_MODULES, repeats=5):
+    """Interpreter startup and the cold import time of each module on top of it, in seconds"""
+    startup = import_time(None, repeats)
+    return {"interpreter": startup, **{module: import_time(module, repeats) - startup for module in modules}}
+
+
+def environment():
+    """Versions and hardware details recorded next to the results"""
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    for module in ("numba", "pandas"):
+        try:
+            meta[module] = __import__(module).__version__
+        except ImportError:
+            meta[module] = None
+    try:
+        meta["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        meta["git_commit"] = None
+    return meta
+
+
+def find_regressions(results, baseline, tolerance):
+    """Compare trials/sec against a baseline run and list the cases that got slower than tolerance allows"""
+    key = lambda r: (r["engine"], r["strategy"], r.get("palette"), r["trials"], r["threads"])
+    baseline_by_key = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = baseline_by_key.get(key(result))
+        if old is None:
+            continue
+        change = result["trials_per_sec"] / old["trials_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append((key(result), old["trials_per_sec"], result["trials_per_sec"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engines and strategies")
+    parser.add_argument("--engines", nargs="*", choices=list(ENGINES), default=["numba"],
+                        help="engines to benchmark (none to only measure import times)")
+    parser.add_argument("--strategies", nargs="+", default=["strategy_1", "strategy_2"])
+    parser.add_argument("--trials", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="trial counts to scale over")
+    parser.add_argument("--pandas-trials", type=int, nargs="+", default=[20],
+                        help="trial counts for the (much slower) pandas engine")
+    parser.add_argument("--threads", type=int, nargs="+", default=None,
+                        help="thread counts to scale over (default: all available threads)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    parser.add_argument("--palette-scales", type=int, nargs="+", default=None,
+                        help="also scale over synthetic palettes with this many times the palette's colors")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative drop in trials/sec before a case counts as a regression")
+    parser.add_argument("--import-times", action="store_true",
+                        help="also measure interpreter startup and the cold import time of each module")
+    args = parser.parse_args(argv)
+
+    report = {"meta": environment()}
+    if args.import_times:
+        report["import_times_seconds"] = import_times()
+        for module, seconds in report["import_times_seconds"].items():
+            print(f"{module:>24} {seconds * 1000:8.1f} ms")
+
+    if args.threads is None:
+        try:
+            import numba
+            args.threads = [numba.config.NUMBA_NUM_THREADS]
+        except ImportError:
+            args.threads = [1]
+
+    palette = load_palette(args.palette)
+    palettes = [palette]
+    for scale in args.palette_scales or []:
+        palettes.append(synthetic_palette(scale * len(palette.base_colors), scale * len(palette.secondary_colors)))
+
+    results = []
+    for engine in args.engines:
+        trial_counts = args.pandas_trials if engine == "pandas" else args.trials
+        thread_counts = [1] if engine in SINGLE_THREADED_ENGINES else args.threads
+        supported = engine_strategies(engine)
+        strategies = [strategy for strategy in args.strategies if strategy in supported]
+        for strategy in args.strategies:
+            if strategy not in supported:
+                print(f"Skipping {strategy} on the {engine} engine, which runs only {', '.join(supported)}")
+        for strategy, palette, threads, n in itertools.product(strategies, palettes, thread_counts, trial_counts):
+            result = benchmark(engine, strategy, n, threads, args.repeats, palette)
+            results.append(result)
+            print(f"{engine:>7} {strategy:>12} {palette.target_count:>6} frogs n={n:<9} threads={threads:<3} "
+                  f"{result['trials_per_sec']:>12.0f} trials/sec {result['breeds_per_sec']:>14.0f} breeds/sec "
+                  f"(warm-up {result['warm_up_seconds']:.2f} s)")
+
+    report["results"] = results
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for (engine, strategy, palette_name, n, threads), old, new, change in regressions:
+            print(f"REGRESSION {engine} {strategy} {palette_name} n={n} threads={threads}: "
+                  f"{old:.0f} -> {new:.0f} trials/sec ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
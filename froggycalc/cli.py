@@ -0,0 +1,66 @@
+import importlib.util
+import sys
+
+# Command -> (module, description). Modules are only imported once their command is picked, so
+# `froggycalc exact` never loads pandas and `froggycalc --help` loads nothing at all.
+COMMANDS = {
+    "simulate": ("froggycalc.numba_engine", "simulate strategies with the fastest installed engine"),
+    "numpy": ("froggycalc.numpy_engine", "simulate with the NumPy engine, which needs no numba"),
+    "remaining": ("froggycalc.collection", "breeds still needed from a partial collection, cached on disk"),
+    "exact": ("froggycalc.exact", "exact breed count distributions, no simulation"),
+    "curve": ("froggycalc.curve", "frogs owned against breeds performed, with a quantile band"),
+    "wheel": ("froggycalc.wheel", "search for the color wheel order that needs the fewest breeds"),
+    "sweep": ("froggycalc.sweep", "sweep strategies over inheritance rule and color wheel variants"),
+    "shards": ("froggycalc.shards", "run or merge independent shards of a large trial budget"),
+    "store": ("froggycalc.store", "stream per-trial results into a resumable on-disk store"),
+    "serve": ("froggycalc.service", "serve expected remaining breeds for collection states over HTTP"),
+    "bench": ("froggycalc.benchmark", "benchmark the engines"),
+    "pandas": ("froggycalc.pandas_engine", "simulate with the original pandas engine"),
+    "compare-engines": ("froggycalc.compare", "time the pandas engine against the numba engine"),
+}
+
+# Module -> (dependency it needs, module to run instead when that dependency is not installed)
+FALLBACKS = {
+    "froggycalc.numba_engine": ("numba", "froggycalc.numpy_engine"),
+}
+
+
+def resolve_module(module_name):
+    """The module to run for a command, falling back when a dependency is missing (checked without importing it)"""
+    if module_name in FALLBACKS:
+        dependency, fallback = FALLBACKS[module_name]
+        if importlib.util.find_spec(dependency) is None:
+            print(f"froggycalc: {dependency} is not installed, using {fallback}", file=sys.stderr)
+            return fallback
+    return module_name
+
+
+def usage():
+    lines = ["usage: froggycalc <command> [options]", "", "commands:"]
+    lines += [f"  {name:<16} {description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "Run `froggycalc <command> --help` for the options of a command."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Dispatch to the main() of the selected command's module"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    if argv[0] == "--version":
+        from froggycalc import __version__
+        print(__version__)
+        return
+    if argv[0] not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        sys.exit(f"froggycalc: unknown command {argv[0]!r}")
+
+    module = importlib.import_module(resolve_module(COMMANDS[argv[0]][0]))
+    # Let argparse show the full command in usage and error messages
+    sys.argv[0] = f"froggycalc {argv[0]}"
+    module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
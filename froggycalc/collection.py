@@ -0,0 +1,162 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from froggycalc.palette import default_palette, load_palette
+from froggycalc.stats import describe_distribution, summarize_histogram
+from froggycalc.tables import create_frog_table
+
+# Results for partial collections, cached on disk so repeated queries for common collection states come
+# back without running any trials. Entries are keyed by a hash of the packed table state.
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "froggycalc")
+
+# Version of the simulated results, hashed into every cache key. Bump it whenever a run with the same seed
+# gives different breed counts (a new random stream layout, a changed strategy or engine), so entries
+# cached by older versions are no longer returned. 2: Philox random streams (froggycalc.rng).
+RESULTS_VERSION = 2
+
+
+class ResultCache:
+    """Directory of breed count histograms, one .npy file per key, evicting the least recently used entries
+
+    Recency is the file's modification time, which every hit refreshes.
+    """
+
+    def __init__(self, directory=None, max_entries=10000):
+        self.directory = directory or os.environ.get("FROGGYCALC_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(strategy, n, frog_table, palette, seed=None):
+        """Compact hash of everything a result depends on: results version, strategy, trials, seed, palette and
+        table state
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([RESULTS_VERSION, strategy, n, seed, palette.base_colors,
+                                  palette.secondary_colors]).encode())
+        digest.update(np.ascontiguousarray(palette.color_wheel_indices).tobytes())
+        digest.update(np.ascontiguousarray(frog_table, dtype=np.uint64).tobytes())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key):
+        """The cached histogram for key, or None"""
+        try:
+            hist = np.load(self.path(key))
+            os.utime(self.path(key))
+        except (OSError, ValueError):
+            return None
+        return hist
+
+    def put(self, key, hist):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file first so a killed writer never leaves a partial entry behind
+        tmp_path = f"{self.path(key)}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, hist)
+        os.replace(tmp_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries beyond max_entries"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy") and ".tmp" not in entry.name:
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def start_table(owned=(), frog_table=None, palette=None):
+    """Bitset start table of a partial collection: the color wheel frogs, the owned (base, secondary) frogs,
+    and every frog of frog_table when one is given
+    """
+    table = create_frog_table(palette, owned)
+    if frog_table is not None:
+        table |= np.asarray(frog_table, dtype=np.uint64)
+    return table
+
+
+def breeds_remaining(strategy, owned=(), n=10000, frog_table=None, seed=None, palette=None, cache=None):
+    """Histogram of the breeds a strategy still needs from a partial collection, and whether it was cached
+
+    The collection is the color wheel plus owned and frog_table (see start_table). With a ResultCache,
+    a state that was queried before is answered from disk without running any trials, or loading numba.
+    """
+    palette = default_palette() if palette is None else palette
+    table = start_table(owned, frog_table, palette)
+    key = None
+    if cache is not None:
+        key = cache.key(strategy, n, table, palette, seed)
+        hist = cache.get(key)
+        if hist is not None:
+            return hist, True
+
+    from froggycalc.numba_engine import run_histogram
+
+    hist = run_histogram(strategy, n, table, seed=seed, palette=palette)
+    if cache is not None:
+        cache.put(key, hist)
+    return hist, False
+
+
+def read_owned(path):
+    """Owned frogs from a JSON file holding a list of [base, secondary] pairs"""
+    with open(path) as f:
+        return [tuple(frog) for frog in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Breeds a strategy still needs from a partial collection")
+    parser.add_argument("owned", nargs="*", metavar="FROG",
+                        help='owned frogs beyond the color wheel, as "Base Secondary" (e.g. "Maroon Pruni")')
+    parser.add_argument("--owned-file", metavar="PATH", help="JSON file with a list of [base, secondary] pairs")
+    parser.add_argument("--strategy", nargs="+", default=["strategy_1", "strategy_2"])
+    parser.add_argument("-n", "--trials", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"result cache directory (default: $FROGGYCALC_CACHE_DIR or {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=int, default=10000, help="cached results kept")
+    parser.add_argument("--no-cache", action="store_true", help="always run the trials")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+
+    owned = [tuple(frog.split()) for frog in args.owned]
+    if any(len(frog) != 2 for frog in owned):
+        parser.error('owned frogs are given as "Base Secondary"')
+    if args.owned_file:
+        owned += read_owned(args.owned_file)
+    palette = load_palette(args.palette)
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_size)
+
+    for strategy in args.strategy:
+        start_time = time.time()
+        try:
+            hist, cached = breeds_remaining(strategy, owned, args.trials, seed=args.seed, palette=palette, cache=cache)
+        except (KeyError, ValueError) as error:
+            parser.error(str(error).strip("'\""))
+        count, mean, m2 = summarize_histogram(hist)[:3]
+        name = strategy.replace("_", " ")
+        source = "from the cache" if cached else f"from {int(count)} trials"
+        print(f"\nRemaining breeding events for {name} ({source} in {time.time() - start_time:.2f} seconds)")
+        print(f"Average: {mean:.2f}, standard deviation: {np.sqrt(m2 / count):.2f}")
+        print(describe_distribution(hist))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import time
+
+import numpy as np
+
+def run_original_simulation(n=500):
+    """Run the original pandas-based simulation for comparison"""
+    from froggycalc.pandas_engine import color_wheel, create_frog_table, strategy_1, strategy_2
+
+    print("=" * 60)
+    print("ORIGINAL PANDAS-BASED IMPLEMENTATION")
+    print("=" * 60)
+    
+    print("Creating frog table")
+    frog_table = create_frog_table()
+
+    print(f"Number of simulations per trial: {n}")
+
+    print("Running strategy 1")
+    start_time = time.time()
+    strategy_1_results = np.zeros(n)
+    for i in range(0, n):
+        strategy_1_results[i] = strategy_1(frog_table.copy(), color_wheel)
+    strategy_1_time = time.time() - start_time
+    print(f"Finished strategy 1 in {strategy_1_time:.2f} seconds")
+
+    print("Running strategy 2")
+    start_time = time.time()
+    strategy_2_results = np.zeros(n)
+    for i in range(0, n):
+        strategy_2_results[i] = strategy_2(frog_table.copy(), color_wheel)
+    strategy_2_time = time.time() - start_time
+    print(f"Finished strategy 2 in {strategy_2_time:.2f} seconds")
+
+    print(f"\nAverage number of breeding events for strategy 1: {np.mean(strategy_1_results):.2f}")
+    print(f"Standard deviation of breeding events for strategy 1: {np.std(strategy_1_results):.2f}")
+    print(f"Strategy 1 execution time: {strategy_1_time:.2f} seconds\n")
+
+    print(f"Average number of breeding events for strategy 2: {np.mean(strategy_2_results):.2f}")
+    print(f"Standard deviation of breeding events for strategy 2: {np.std(strategy_2_results):.2f}")
+    print(f"Strategy 2 execution time: {strategy_2_time:.2f} seconds")
+
+    return strategy_1_time, strategy_2_time
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the original pandas engine against the numba engine")
+    parser.add_argument("-n", "--trials", type=int, default=500, help="number of trials per strategy")
+    args = parser.parse_args(argv)
+
+    # Imported here so that run_original_simulation alone does not pull in numba
+    from froggycalc.numba_engine import run_simulation
+
+    # Run both versions for comparison
+    original_s1_time, original_s2_time = run_original_simulation(args.trials)
+    
+    print("\n" + "=" * 60)
+    print("OPTIMIZED NUMPY + NUMBA IMPLEMENTATION")  
+    print("=" * 60)
+    
+    # Strategy times only, so JIT warm-up, setup and printing stay out of the comparison
+    optimized_time = sum(strategy_time for _, _, strategy_time, _ in run_simulation(args.trials))
+    original_time = original_s1_time + original_s2_time
+    
+    print("\n" + "=" * 60)
+    print("PERFORMANCE COMPARISON")
+    print("=" * 60)
+    print(f"Original implementation total time: {original_time:.2f} seconds")
+    print(f"Optimized implementation total time: {optimized_time:.2f} seconds")
+    print(f"Speedup: {original_time / optimized_time:.1f}x faster")
+    print("For steady-state throughput without setup and printing, run `froggycalc bench`")
+
+
+if __name__ == "__main__":
+    main()
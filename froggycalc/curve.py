@@ -0,0 +1,145 @@
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from froggycalc.palette import load_palette
+
+# The collection completion curve: frogs owned against breeds performed over the course of a strategy.
+# Trajectories are never stored. The compiled kernels note the breed at which each new frog lands, and
+# the trial loop folds those breeds straight into per frog count accumulators, whose size is fixed by the
+# palette and the number of bins, however many trials run.
+#
+# Per new frog f, breeds[f] is the number of breeds a trial had performed when its f-th new frog landed.
+# The curve keeps their sums and sums of squares (exact means and spreads), and a histogram over bins of
+# bin_width breeds, the last bin also holding every longer trial. A trial owns at least start_frogs + f + 1
+# frogs after b breeds exactly when breeds[f] <= b, so the same histograms also give the distribution of
+# the frogs owned after any number of breeds.
+CompletionCurve = namedtuple("CompletionCurve", [
+    "start_frogs", "trials", "bin_width", "breed_sums", "breed_squares", "hist",
+])
+
+# Quantile band reported around the median
+CURVE_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def empty_curve(start_frogs, n_new, bin_width, n_bins):
+    """A completion curve of no trials, for n_new frogs on top of start_frogs"""
+    return CompletionCurve(start_frogs, 0, bin_width, np.zeros(n_new, dtype=np.int64),
+                           np.zeros(n_new, dtype=np.int64), np.zeros((n_new, n_bins), dtype=np.int64))
+
+
+def merge_curves(a, b):
+    """Combine the curves of two sets of trials of the same start table and bins"""
+    if (a.start_frogs, a.bin_width, a.hist.shape) != (b.start_frogs, b.bin_width, b.hist.shape):
+        raise ValueError("Only curves of the same start table and bins can be merged")
+    return CompletionCurve(a.start_frogs, a.trials + b.trials, a.bin_width, a.breed_sums + b.breed_sums,
+                           a.breed_squares + b.breed_squares, a.hist + b.hist)
+
+
+def bin_upper_edges(curve):
+    """Largest breed count in each bin"""
+    return (np.arange(curve.hist.shape[1]) + 1) * curve.bin_width - 1
+
+
+def breeds_to_reach(curve, quantiles=CURVE_QUANTILES):
+    """Per frog count: (frogs, mean breeds, standard deviation, breeds at each quantile)
+
+    Quantiles are the upper edges of the bins they fall in, so they are exact for a bin width of 1.
+    """
+    frogs = curve.start_frogs + 1 + np.arange(len(curve.breed_sums))
+    mean = curve.breed_sums / curve.trials
+    std = np.sqrt(np.maximum(curve.breed_squares / curve.trials - mean ** 2, 0))
+    cumulative = np.cumsum(curve.hist, axis=1)
+    edges = bin_upper_edges(curve)
+    bands = [edges[(cumulative < q * curve.trials).sum(axis=1)] for q in quantiles]
+    return frogs, mean, std, bands
+
+
+def frogs_after(curve, breeds, quantiles=CURVE_QUANTILES):
+    """Mean frogs owned after a number of breeds, and the frogs owned at each quantile
+
+    breeds is rounded down to a bin upper edge, where the histograms are exact.
+    """
+    bins = min((breeds + 1) // curve.bin_width, curve.hist.shape[1] - 1)
+    if bins == 0:
+        return float(curve.start_frogs), [curve.start_frogs for _ in quantiles]
+    # Share of the trials that own frog f by then
+    reached = curve.hist[:, :bins].sum(axis=1) / curve.trials
+    mean = curve.start_frogs + reached.sum()
+    return mean, [curve.start_frogs + int((reached > 1 - q).sum()) for q in quantiles]
+
+
+def save_curve(curve, path, quantiles=CURVE_QUANTILES):
+    """Write a curve to a CSV file, one row per frog count"""
+    frogs, mean, std, bands = breeds_to_reach(curve, quantiles)
+    names = ",".join(f"p{q * 100:g}_breeds" for q in quantiles)
+    np.savetxt(path, np.column_stack([frogs, mean, std, *bands]), delimiter=",", comments="",
+               header=f"frogs,mean_breeds,std_breeds,{names}", fmt=["%d", "%.4f", "%.4f", *["%d"] * len(quantiles)])
+
+
+def print_curve(name, curve, rows=10, frogs=(), breeds=(), quantiles=CURVE_QUANTILES):
+    """Print about rows evenly spaced frog counts of a curve, and the asked frog and breed counts"""
+    all_frogs, mean, std, bands = breeds_to_reach(curve, quantiles)
+    picked = np.unique(np.linspace(0, len(all_frogs) - 1, min(rows, len(all_frogs))).round().astype(int))
+    asked = [f - all_frogs[0] for f in frogs if all_frogs[0] <= f <= all_frogs[-1]]
+    picked = np.union1d(picked, np.array(asked, dtype=picked.dtype))
+    names = "".join(f"{f'p{q * 100:g}':>8}" for q in quantiles)
+
+    print(f"\nBreeds to reach each frog count for {name} ({curve.trials} trials, {curve.start_frogs} frogs at the start)")
+    print(f"{'frogs':>7} {'mean':>9} {'std':>8}{names}")
+    for i in picked:
+        quantile_breeds = "".join(f"{band[i]:>8}" for band in bands)
+        print(f"{all_frogs[i]:>7} {mean[i]:>9.2f} {std[i]:>8.2f}{quantile_breeds}")
+    for b in breeds:
+        owned_mean, owned = frogs_after(curve, b, quantiles)
+        band = " / ".join(str(frog_count) for frog_count in owned)
+        print(f"Frogs owned after {b} breeds: {owned_mean:.2f} on average, "
+              f"{' / '.join(f'p{q * 100:g}' for q in quantiles)}: {band}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frogs owned against breeds performed, accumulated in the kernels")
+    parser.add_argument("-n", "--trials", type=int, default=10000)
+    parser.add_argument("--strategy", nargs="+", default=["strategy_1", "strategy_2"])
+    parser.add_argument("--bins", type=int, default=512, help="breed count bins per frog count")
+    parser.add_argument("--bin-width", type=int, default=None,
+                        help="breeds per bin (default: enough bins for twice the mean breeds, from a pilot run)")
+    parser.add_argument("--rows", type=int, default=10, help="frog counts printed, evenly spaced")
+    parser.add_argument("--frogs", type=int, nargs="+", default=[], help="also print these frog counts")
+    parser.add_argument("--breeds", type=int, nargs="+", default=[], help="print the frogs owned after these breeds")
+    parser.add_argument("--csv", metavar="PREFIX", help="save each strategy's curve to PREFIX_<strategy>.csv")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    if args.bins < 1:
+        parser.error("--bins must be at least 1")
+    if args.bin_width is not None and args.bin_width < 1:
+        parser.error("--bin-width must be at least 1")
+
+    from froggycalc.numba_engine import CURVE_STRATEGIES, fresh_seed, run_curve, warm_up
+
+    unknown = [strategy for strategy in args.strategy if strategy not in CURVE_STRATEGIES]
+    if unknown:
+        parser.error(f"no completion curve for {', '.join(unknown)} (choose from {', '.join(CURVE_STRATEGIES)})")
+    palette = load_palette(args.palette)
+    seed = fresh_seed() if args.seed is None else args.seed
+    print(f"Seed: {seed}")
+    print("Warming up kernels")
+    warm_up(args.strategy, curve=True)
+
+    for strategy in args.strategy:
+        start_time = time.time()
+        curve = run_curve(strategy, args.trials, bin_width=args.bin_width, n_bins=args.bins, seed=seed,
+                          palette=palette)
+        print(f"\nRan {strategy.replace('_', ' ')} in {time.time() - start_time:.2f} seconds")
+        print_curve(strategy.replace("_", " "), curve, args.rows, args.frogs, args.breeds)
+        if args.csv:
+            save_curve(curve, f"{args.csv}_{strategy}.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import time
+from collections import namedtuple
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+from froggycalc.numpy_engine import COUNT_RULES
+from froggycalc.palette import default_palette, load_palette
+from froggycalc.plan import PLAN_I, PLAN_J, build_plan
+from froggycalc.tables import create_frog_table
+
+# Probability mass below this is dropped from the tails of the distributions
+PMF_TOLERANCE = 1e-16
+
+# Exact mean and variance (as Fractions) plus the breed count distribution: pmf[k] = P(total == offset + k)
+ExactResult = namedtuple("ExactResult", ["mean", "variance", "pmf", "offset"])
+
+
+def _trim(pmf, offset):
+    """Drop negligible probability mass from both tails of a pmf"""
+    nonzero = np.nonzero(pmf > PMF_TOLERANCE)[0]
+    if len(nonzero) == 0:
+        return np.array([1.0]), offset
+    return pmf[nonzero[0]:nonzero[-1] + 1], offset + nonzero[0]
+
+
+@lru_cache(maxsize=None)
+def pair_breeds(target_probs):
+    """Exact distribution of the breeds needed until every missing target of a pair is owned
+
+    target_probs holds, for each missing target cell, the probability that one breed produces it.
+    Returns (mean, variance, pmf) with pmf[k] = P(k breeds).
+    """
+    n_targets = len(target_probs)
+    if n_targets == 0:
+        return Fraction(0), Fraction(0), np.array([1.0])
+    if sum(target_probs) == 0:
+        raise ValueError("Pair can never produce its missing offspring")
+
+    # Moments by recursion over the subsets of targets still missing. From subset S the chain waits a
+    # geometric number of breeds for any target in S, then moves to S without that target.
+    full = (1 << n_targets) - 1
+    means = {0: Fraction(0)}
+    second_moments = {0: Fraction(0)}
+    for subset in range(1, full + 1):
+        targets = [t for t in range(n_targets) if subset >> t & 1]
+        r = sum(target_probs[t] for t in targets)
+        wait_mean = 1 / r
+        wait_second_moment = (1 - r) / r ** 2 + wait_mean ** 2
+        rest_mean = sum(target_probs[t] / r * means[subset & ~(1 << t)] for t in targets)
+        rest_second_moment = sum(target_probs[t] / r * second_moments[subset & ~(1 << t)] for t in targets)
+        means[subset] = wait_mean + rest_mean
+        second_moments[subset] = wait_second_moment + 2 * wait_mean * rest_mean + rest_second_moment
+
+    # Distribution by stepping the probability vector over subsets until the remaining mass is negligible
+    probs = [float(p) for p in target_probs]
+    state = np.zeros(full + 1)
+    state[full] = 1.0
+    pmf = [0.0]
+    while state[1:].sum() > PMF_TOLERANCE:
+        next_state = np.zeros(full + 1)
+        for subset in range(1, full + 1):
+            if state[subset] == 0:
+                continue
+            stay = 1.0
+            for t in range(n_targets):
+                if subset >> t & 1:
+                    next_state[subset & ~(1 << t)] += state[subset] * probs[t]
+                    stay -= probs[t]
+            next_state[subset] += state[subset] * stay
+        pmf.append(next_state[0])
+        next_state[0] = 0.0
+        state = next_state
+
+    return means[full], second_moments[full] - means[full] ** 2, np.array(pmf)
+
+
+def pair_transition(frog_table, wheel, i, j):
+    """Missing target probabilities for pair (i, j) and the table once the pair loop finishes"""
+    frog_1_base, frog_1_sec = wheel[i]
+    frog_2_base, frog_2_sec = wheel[j]
+
+    # Each breed picks the base and secondary color from either parent with probability 1/2
+    cell_probs = {}
+    for base in (frog_1_base, frog_2_base):
+        for sec in (frog_1_sec, frog_2_sec):
+            cell_probs[base, sec] = cell_probs.get((base, sec), Fraction(0)) + Fraction(1, 4)
+
+    targets = {(frog_1_base, frog_2_sec), (frog_2_base, frog_1_sec)}
+    missing = sorted(cell for cell in targets if not (frog_table[cell[0]] >> cell[1]) & 1)
+
+    # The loop only stops once both targets are owned, and every breed lands on a parent or a target,
+    # so the finished table does not depend on the order the offspring came in
+    next_table = list(frog_table)
+    for base, sec in missing:
+        next_table[base] |= 1 << sec
+
+    return tuple(cell_probs.get(cell, Fraction(0)) for cell in missing), tuple(next_table)
+
+
+def _row_ints(frog_table):
+    """Bitset frog table rows as Python integers, whatever the number of words per row"""
+    return tuple(sum(int(word) << (64 * k) for k, word in enumerate(row)) for row in frog_table)
+
+
+def _cells(rows, n_secondary):
+    """Python integer rows as the one-trial (1, cells) boolean table the NumPy engine's hooks take"""
+    return np.array([[(row >> sec) & 1 for row in rows for sec in range(n_secondary)]], dtype=bool)
+
+
+def _mix(a, b):
+    """Mix two (prob, mean, variance, pmf, offset) states that reached the same table"""
+    prob = a[0] + b[0]
+    mean = (a[0] * a[1] + b[0] * b[1]) / prob
+    variance = (a[0] * (a[2] + a[1] ** 2) + b[0] * (b[2] + b[1] ** 2)) / prob - mean ** 2
+    offset = min(a[4], b[4])
+    pmf = np.zeros(max(a[4] + len(a[3]), b[4] + len(b[3])) - offset)
+    pmf[a[4] - offset:a[4] - offset + len(a[3])] += float(a[0] / prob) * a[3]
+    pmf[b[4] - offset:b[4] - offset + len(b[3])] += float(b[0] / prob) * b[3]
+    return prob, mean, variance, pmf, offset
+
+
+def exact_breeds(strategy="strategy_1", frog_table=None, wheel=None, palette=None):
+    """Exact mean, variance and distribution of the total breeds for a strategy
+
+    Runs a dynamic program over the reachable table states, one pair loop at a time.
+    frog_table and wheel default to the palette's (default palettes/pocket_frogs.json) starting table and
+    color wheel.
+    """
+    # The strategy's counting hook decides which pair loops count. The NumPy engine's hooks need no numba.
+    if strategy not in COUNT_RULES:
+        raise ValueError(f"{strategy!r} is not a pair schedule strategy, exact results need one of: "
+                         f"{', '.join(COUNT_RULES)}")
+    count_pair = COUNT_RULES[strategy]
+    if palette is None:
+        palette = default_palette()
+    if frog_table is None:
+        frog_table = create_frog_table(palette)
+    if wheel is None:
+        wheel = palette.color_wheel_indices
+    n_secondary = len(palette.secondary_colors)
+    plan = build_plan(wheel, n_secondary)
+    wheel = tuple((int(base), int(sec)) for base, sec in wheel)
+
+    # Reachable table -> (probability, mean, variance, pmf, offset) of the breeds counted so far
+    states = {_row_ints(frog_table): (Fraction(1), Fraction(0), Fraction(0), np.array([1.0]), 0)}
+
+    for k in range(len(plan)):
+        i, j = int(plan[k, PLAN_I]), int(plan[k, PLAN_J])
+        next_states = {}
+        for table, (prob, mean, variance, pmf, offset) in states.items():
+            target_probs, next_table = pair_transition(table, wheel, i, j)
+            if count_pair(_cells(next_table, n_secondary), plan, k)[0]:
+                pair_mean, pair_variance, pair_pmf = pair_breeds(target_probs)
+                mean, variance = mean + pair_mean, variance + pair_variance
+                pmf, offset = _trim(np.convolve(pmf, pair_pmf), offset)
+            state = (prob, mean, variance, pmf, offset)
+            if next_table in next_states:
+                state = _mix(next_states[next_table], state)
+            next_states[next_table] = state
+        states = next_states
+
+    result = None
+    for state in states.values():
+        result = state if result is None else _mix(result, state)
+    _, mean, variance, pmf, offset = result
+    return ExactResult(mean, variance, pmf / pmf.sum(), offset)
+
+
+def quantile(result, q):
+    """Smallest breed count whose cumulative probability reaches q"""
+    return result.offset + int(np.searchsorted(np.cumsum(result.pmf), q))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact expected number of breeding events per strategy")
+    parser.add_argument("--strategy", choices=list(COUNT_RULES), nargs="+", default=list(COUNT_RULES))
+    parser.add_argument("--save", metavar="PREFIX", help="write each distribution to PREFIX_<strategy>.csv")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+    palette = load_palette(args.palette)
+
+    for strategy in args.strategy:
+        start_time = time.time()
+        result = exact_breeds(strategy, palette=palette)
+        elapsed = time.time() - start_time
+
+        print(f"\nExact average number of breeding events for {strategy}: {float(result.mean):.4f}")
+        print(f"Exact standard deviation of breeding events for {strategy}: {float(result.variance) ** 0.5:.4f}")
+        print(f"Median / 90th / 99th percentile: "
+              f"{quantile(result, 0.5)} / {quantile(result, 0.9)} / {quantile(result, 0.99)}")
+        print(f"Computed in {elapsed:.2f} seconds")
+
+        if args.save:
+            breeds = np.arange(result.offset, result.offset + len(result.pmf))
+            np.savetxt(f"{args.save}_{strategy}.csv", np.column_stack([breeds, result.pmf]),
+                       delimiter=",", header="breeds,probability", comments="", fmt=["%d", "%.6e"])
+
+
+if __name__ == "__main__":
+    main()
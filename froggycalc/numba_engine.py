@@ -0,0 +1,944 @@
+import argparse
+import numpy as np
+from numba import jit, prange, get_num_threads
+import time
+from statistics import NormalDist
+
+from froggycalc.curve import CompletionCurve, empty_curve, merge_curves
+from froggycalc.palette import default_palette, load_palette
+from froggycalc.plan import (PLAN_BIT_1, PLAN_BIT_2, PLAN_I, PLAN_J, PLAN_REDUNDANT, PLAN_WORD_1, PLAN_WORD_2,
+                             build_plan, palette_plan, remaining_plan, words_per_row)
+from froggycalc.rng import MASK_32, SHIFT_32, fresh_seed, philox4x32, stream_key
+from froggycalc.stats import (confidence_half_width, describe_distribution, histogram, merge_histograms, merge_stats,
+                              summarize, summarize_histogram)
+from froggycalc.tables import (VALIDATION_STRIDES, create_frog_table, full_frog_table, pack_frog_table,
+                               unpack_frog_table, validation_stride)
+
+# The palette the engines run on unless told otherwise (palettes/pocket_frogs.json), compiled into index arrays
+PALETTE = default_palette()
+base_colors = PALETTE.base_colors
+secondary_colors = PALETTE.secondary_colors
+color_wheel = PALETTE.color_wheel
+base_to_idx = PALETTE.base_to_idx
+secondary_to_idx = PALETTE.secondary_to_idx
+color_wheel_indices = PALETTE.color_wheel_indices
+
+# The frog table is one bitset row per base color, with bit s set when that base color is owned with
+# secondary s. Rows are split into 64-bit words (words_per_row), so secondary s lives in bit s % 64 of
+# frog_table[base, s // 64]. The kernels address the table through the flat word indices of a breeding plan.
+
+# Flips the base color bit of every breed. Flipping both bits would only swap the roles of a pair's two
+# targets (same breed count); flipping the base bit turns target offspring into parent copies and back.
+ANTITHETIC_MASK = np.uint64(0x5555555555555555)
+
+# Inheritance rule of a breed, as two thresholds out of 2 ** 32: the offspring takes frog_1's base color when
+# a 32-bit random draw is below the first, and frog_1's secondary color when another is below the second.
+# The game's rule is even odds for both, which the kernels draw as one random bit per color instead.
+EVEN_ODDS = np.uint64(1 << 31)
+
+philox_numba = jit(nopython=True, cache=True, inline="always")(philox4x32)
+
+@jit(nopython=True, cache=True)
+def new_bit_buffer():
+    """Create an empty random bit buffer: [64-bit word, number of unused bits, mask XORed into each new word,
+    base color threshold, secondary color threshold, stream key, stream trial, next word index, spare word],
+    with the game's even odds inheritance rule
+    """
+    bit_buffer = np.zeros(9, dtype=np.uint64)
+    bit_buffer[3] = EVEN_ODDS
+    bit_buffer[4] = EVEN_ODDS
+    return bit_buffer
+
+@jit(nopython=True, cache=True)
+def start_stream(bit_buffer, key, trial):
+    """Point the buffer at the start of a trial's random stream (froggycalc.rng), dropping any unused bits"""
+    bit_buffer[1] = 0
+    bit_buffer[5] = key
+    bit_buffer[6] = trial
+    bit_buffer[7] = 0
+
+@jit(nopython=True, cache=True, inline="always")
+def stream_block(key, trial, block):
+    """The two 64-bit words of one Philox block of a trial's random stream (froggycalc.rng.random_words)"""
+    x0, x1, x2, x3 = philox_numba(block & MASK_32, block >> SHIFT_32, trial & MASK_32, trial >> SHIFT_32,
+                                  key & MASK_32, key >> SHIFT_32)
+    return (x1 << SHIFT_32) | x0, (x3 << SHIFT_32) | x2
+
+@jit(nopython=True, cache=True, inline="always")
+def random_bits_numba(bit_buffer, k):
+    """Take k random bits (k must divide 64) from the buffer, refilling it with the next word of its stream
+
+    Each Philox block holds two words; the second waits in the spare word slot until it is needed.
+    The refill is inlined all the way into the breeding loops: any call left in them would make numba
+    reference count the buffer on every breed.
+    """
+    if bit_buffer[1] < k:
+        index = bit_buffer[7]
+        if index & np.uint64(1):
+            word = bit_buffer[8]
+        else:
+            word, bit_buffer[8] = stream_block(bit_buffer[5], bit_buffer[6], index >> np.uint64(1))
+        bit_buffer[7] = index + np.uint64(1)
+        bit_buffer[0] = word ^ bit_buffer[2]
+        bit_buffer[1] = 64
+    bits = bit_buffer[0] & ((np.uint64(1) << np.uint64(k)) - np.uint64(1))
+    bit_buffer[0] >>= np.uint64(k)
+    bit_buffer[1] -= np.uint64(k)
+    return bits
+
+@jit(nopython=True, cache=True)
+def has_even_odds(bit_buffer):
+    """Whether the buffer's inheritance rule is the game's, so breeds can be drawn as 2 random bits"""
+    return bit_buffer[3] == EVEN_ODDS and bit_buffer[4] == EVEN_ODDS
+
+@jit(nopython=True, cache=True)
+def offspring_code(bit_buffer):
+    """Draw one breed under the buffer's inheritance rule: bit 0 is set when the offspring takes frog_1's
+    base color, bit 1 when it takes frog_1's secondary color
+
+    Kernels check has_even_odds once per trial and call random_bits_numba(bit_buffer, 2) directly when it
+    holds, which draws the same codes without this call in the breeding loop.
+    """
+    base_bit = np.uint64(1) if random_bits_numba(bit_buffer, 32) < bit_buffer[3] else np.uint64(0)
+    sec_bit = np.uint64(2) if random_bits_numba(bit_buffer, 32) < bit_buffer[4] else np.uint64(0)
+    return base_bit | sec_bit
+
+def inheritance_rule(p_base=0.5, p_secondary=0.5):
+    """Bit buffer thresholds of an inheritance rule, given the chances that an offspring takes frog_1's base
+    and secondary colors
+    """
+    # A 32-bit draw below the threshold takes frog_1's color, so a threshold of 0 or 2 ** 32 (including
+    # probabilities that round to one) never lets one parent's color through
+    thresholds = [round(p * 2 ** 32) if 0 < p < 1 else 0 for p in (p_base, p_secondary)]
+    if not all(0 < threshold < 2 ** 32 for threshold in thresholds):
+        raise ValueError("Inheritance probabilities must be strictly between 0 and 1 at 32-bit resolution, "
+                         "or some frogs never appear")
+    return np.array(thresholds, dtype=np.uint64)
+
+@jit(nopython=True, cache=True)
+def breed_pair_numba(frog_1_base_idx, frog_1_sec_idx, frog_2_base_idx, frog_2_sec_idx, bit_buffer):
+    """Breed two frogs and return offspring indices, drawn under the buffer's inheritance rule"""
+    bits = random_bits_numba(bit_buffer, 2) if has_even_odds(bit_buffer) else offspring_code(bit_buffer)
+    base_idx = frog_1_base_idx if bits & np.uint64(1) else frog_2_base_idx
+    sec_idx = frog_1_sec_idx if bits & np.uint64(2) else frog_2_sec_idx
+    return base_idx, sec_idx
+
+@jit(nopython=True, cache=True)
+def has_frog(frog_table, base_idx, sec_idx):
+    """Check whether the table owns the frog (base_idx, sec_idx)"""
+    return (frog_table[base_idx, sec_idx >> 6] >> np.uint64(sec_idx & 63)) & np.uint64(1) != 0
+
+@jit(nopython=True, cache=True)
+def owns_cell(table_words, word, bit):
+    """Check whether the flattened table owns the frog at a breeding plan's (word, bit) cell"""
+    return (table_words[word] >> np.uint64(bit)) & np.uint64(1) != 0
+
+# Strategy registry: name -> compiled strategy kernel with signature
+# (frog_table, plan, bit_buffer, pair_stats) returning the strategy's breed count
+STRATEGIES = {}
+
+# Instrumented variants of the registered strategies, which also accumulate per-pair breed statistics
+# into pair_stats (plain kernels never touch it)
+INSTRUMENTED_STRATEGIES = {}
+
+# count_pair hooks of the strategies built on the shared pair schedule, by name
+PAIR_COUNT_RULES = {}
+
+# Plain and instrumented kernels of those strategies, which can skip the pairs a start table already completes
+PAIR_SCHEDULE_KERNELS = set()
+
+# Completion curve variants of the strategies, by name. They take the trial's arrivals array in place of
+# pair_stats and set arrivals[f] to the breed (counting from 1, and counting every breed performed) that
+# brought the trial's f-th new frog.
+CURVE_STRATEGIES = {}
+
+def stable_dispatcher(dispatcher, key):
+    """Give a jitted function a fixed identity so that kernels closing over it, or taking it as an
+    argument, are found in numba's on-disk cache by every new process
+
+    Numba keys those kernels on the pickled dispatcher, which otherwise carries a random per-process id.
+    The id is set through a private numba method; on a numba without it the kernels still work, but
+    each process compiles them again instead of loading them from the cache.
+    """
+    try:
+        dispatcher._set_uuid(f"froggycalc:{key}")
+    except AssertionError:
+        # Already has an identity (the function was registered or pickled before)
+        pass
+    except AttributeError:
+        # This numba has no _set_uuid: keep the random per-process id
+        pass
+    return dispatcher
+
+def pair_schedule_kernel(count_pair, instrumented=False, record_arrivals=False):
+    """Build the compiled pair loop shared by the pair schedule strategies around their counting hook
+
+    The loop walks the rows of a breeding plan (froggycalc.plan). count_pair(table_words, plan, k) is
+    called once pair operation k has both of its offspring, with the frog table flattened to its words,
+    and decides whether the breeds spent on that pair count towards the total.
+
+    The instrumented kernel also adds the breeds performed on each pair (i, j), and their squares, into
+    pair_stats[0, i, j] and pair_stats[1, i, j]. The curve kernel (record_arrivals) records the breed
+    of every new frog instead (see CURVE_STRATEGIES). The flags are compile-time constants, so the plain
+    kernel is compiled without that code.
+    """
+    @jit(nopython=True, cache=True)
+    def strategy_numba(frog_table, plan, bit_buffer, pair_stats):
+        total_breeds = 0
+        table_words = frog_table.reshape(-1)
+        even_odds = has_even_odds(bit_buffer)
+        performed = 0
+        new_frogs = 0
+
+        # Breed the pairs in plan order, each until its 2 target offspring are in the table
+        for k in range(len(plan)):
+            word_1 = plan[k, PLAN_WORD_1]
+            bit_1 = np.uint64(1) << np.uint64(plan[k, PLAN_BIT_1])
+            word_2 = plan[k, PLAN_WORD_2]
+            bit_2 = np.uint64(1) << np.uint64(plan[k, PLAN_BIT_2])
+
+            num_breeds = 0
+            while not ((table_words[word_1] & bit_1) and (table_words[word_2] & bit_2)):
+                # Bit 0 picks frog_1's base color, bit 1 frog_1's secondary color. Only the mixed offspring
+                # are targets, the other two are copies of the parents and already owned.
+                bits = random_bits_numba(bit_buffer, 2) if even_odds else offspring_code(bit_buffer)
+                num_breeds += 1
+                if record_arrivals:
+                    if (bits == np.uint64(1) and not table_words[word_1] & bit_1
+                            or bits == np.uint64(2) and not table_words[word_2] & bit_2):
+                        pair_stats[new_frogs] = performed + num_breeds
+                        new_frogs += 1
+                if bits == np.uint64(1):
+                    table_words[word_1] |= bit_1
+                elif bits == np.uint64(2):
+                    table_words[word_2] |= bit_2
+
+            if instrumented:
+                pair_stats[0, plan[k, PLAN_I], plan[k, PLAN_J]] += num_breeds
+                pair_stats[1, plan[k, PLAN_I], plan[k, PLAN_J]] += num_breeds * num_breeds
+            performed += num_breeds
+
+            if count_pair(table_words, plan, k):
+                total_breeds += num_breeds
+
+        return total_breeds
+
+    return strategy_numba
+
+def register_kernel(name, kernel, curve_kernel=None):
+    """Register a compiled strategy kernel under a name, with its completion curve variant if it has one"""
+    if name in STRATEGIES:
+        raise ValueError(f"Strategy {name!r} is already registered")
+    STRATEGIES[name] = stable_dispatcher(kernel, f"strategy:{name}")
+    if curve_kernel is not None:
+        CURVE_STRATEGIES[name] = stable_dispatcher(curve_kernel, f"curve:{name}")
+    return kernel
+
+def register_strategy(name):
+    """Decorator that compiles a pair counting hook and registers the pair schedule strategy built on it"""
+    def decorator(count_pair):
+        hook = stable_dispatcher(jit(nopython=True, cache=True)(count_pair), f"count_pair:{name}")
+        register_kernel(name, pair_schedule_kernel(hook), pair_schedule_kernel(hook, record_arrivals=True))
+        INSTRUMENTED_STRATEGIES[name] = stable_dispatcher(
+            pair_schedule_kernel(hook, instrumented=True), f"instrumented:{name}"
+        )
+        PAIR_COUNT_RULES[name] = hook
+        PAIR_SCHEDULE_KERNELS.update((STRATEGIES[name], INSTRUMENTED_STRATEGIES[name], CURVE_STRATEGIES[name]))
+        return hook
+    return decorator
+
+def get_strategy(name):
+    """Look up a registered strategy kernel by name"""
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise KeyError(f"Unknown strategy {name!r}, registered strategies: {', '.join(STRATEGIES)}") from None
+
+@register_strategy("strategy_1")
+def count_every_pair(table_words, plan, k):
+    """Strategy 1: count the breeds of every pair"""
+    return True
+
+@register_strategy("strategy_2")
+def count_unless_redundant(table_words, plan, k):
+    """Strategy 2: skip the breeds of a pair when frog_1's secondary color is redundant"""
+    # If frog_1's secondary is redundant, and we got frog_2's secondary color we can quit early
+    return not (plan[k, PLAN_REDUNDANT] and owns_cell(table_words, plan[k, PLAN_WORD_1], plan[k, PLAN_BIT_1]))
+
+strategy_1_numba = get_strategy("strategy_1")
+strategy_2_numba = get_strategy("strategy_2")
+
+# The greedy strategy breeds any two owned frogs, not just color wheel pairs. Owned frogs (b1, s1) and
+# (b2, s2) have the targets (b1, s2) and (b2, s1), each bred with probability 1/4, so the best pairs are
+# the double pairs, with both targets missing. Base rows b1 and b2 hold a double pair exactly when each
+# row owns a secondary color the other misses, so the strategy indexes the incomparable pairs of rows.
+# A new frog only changes its own row, so it updates n_base - 1 entries of the index instead of rescanning.
+
+@jit(nopython=True, cache=True)
+def lowest_bit(word):
+    """Index of the lowest set bit of a nonzero 64-bit word"""
+    index = 0
+    while not word & np.uint64(1):
+        word >>= np.uint64(1)
+        index += 1
+    return index
+
+def greedy_kernel(record_arrivals=False):
+    """Build the greedy strategy kernel: always breed an owned pair with the highest chance of a missing frog,
+    counting every breed
+
+    The choice is made again whenever a frog lands. Ties go to the rows and secondary colors missing
+    the most frogs, which keeps rows incomparable, and double pairs available, for longer. The breeding
+    plan is not used, since the strategy does not follow the color wheel's pair schedule. With
+    record_arrivals, the kernel is the strategy's completion curve variant (see CURVE_STRATEGIES).
+    """
+    @jit(nopython=True, cache=True)
+    def greedy_numba(frog_table, plan, bit_buffer, pair_stats):
+        n_base, n_words = frog_table.shape
+
+        # The color wheel covers every secondary color, so the union of the start rows is a complete row
+        complete_row = np.zeros(n_words, dtype=np.uint64)
+        for base_idx in range(n_base):
+            for word in range(n_words):
+                complete_row[word] |= frog_table[base_idx, word]
+        missing = np.zeros(n_base, dtype=np.int64)
+        missing_secondary = np.zeros(n_words * 64, dtype=np.int64)
+        for base_idx in range(n_base):
+            for word in range(n_words):
+                missing_bits = complete_row[word] & ~frog_table[base_idx, word]
+                while missing_bits:
+                    missing[base_idx] += 1
+                    missing_secondary[word * 64 + lowest_bit(missing_bits)] += 1
+                    missing_bits &= missing_bits - np.uint64(1)
+
+        # Index of the incomparable row pairs, and the number of them each row is in
+        incomparable = np.zeros((n_base, n_base), dtype=np.bool_)
+        partners = np.zeros(n_base, dtype=np.int64)
+
+        total_breeds = 0
+        new_frogs = 0
+        even_odds = has_even_odds(bit_buffer)
+        first_row, stop_row = 0, n_base
+        while True:
+            # Bring the index up to date for the rows that changed: every row at the start, then the new frog's row
+            for b1 in range(first_row, stop_row):
+                for b2 in range(n_base):
+                    only_1 = only_2 = np.uint64(0)
+                    for word in range(n_words):
+                        only_1 |= frog_table[b1, word] & ~frog_table[b2, word]
+                        only_2 |= frog_table[b2, word] & ~frog_table[b1, word]
+                    now_incomparable = only_1 != 0 and only_2 != 0
+                    if now_incomparable != incomparable[b1, b2]:
+                        incomparable[b1, b2] = incomparable[b2, b1] = now_incomparable
+                        change = 1 if now_incomparable else -1
+                        partners[b1] += change
+                        partners[b2] += change
+
+            b1 = -1
+            for base_idx in range(n_base):
+                if partners[base_idx] > 0 and (b1 < 0 or missing[base_idx] > missing[b1]):
+                    b1 = base_idx
+
+            if b1 >= 0:
+                # Parents (b1, s1) and (b2, s2) with both targets (b1, s2) and (b2, s1) missing
+                b2 = -1
+                for base_idx in range(n_base):
+                    if incomparable[b1, base_idx] and (b2 < 0 or missing[base_idx] > missing[b2]):
+                        b2 = base_idx
+                s1 = s2 = -1
+                for word in range(n_words):
+                    only_1 = frog_table[b1, word] & ~frog_table[b2, word]
+                    while only_1:
+                        sec_idx = word * 64 + lowest_bit(only_1)
+                        if s1 < 0 or missing_secondary[sec_idx] > missing_secondary[s1]:
+                            s1 = sec_idx
+                        only_1 &= only_1 - np.uint64(1)
+                    only_2 = frog_table[b2, word] & ~frog_table[b1, word]
+                    while only_2:
+                        sec_idx = word * 64 + lowest_bit(only_2)
+                        if s2 < 0 or missing_secondary[sec_idx] > missing_secondary[s2]:
+                            s2 = sec_idx
+                        only_2 &= only_2 - np.uint64(1)
+            else:
+                # The rows are ordered by inclusion, so a row owning s2 also owns b1's secondaries and the
+                # pair's other target (b2, s1) is owned: a single pair for a missing frog of the row missing most
+                b1 = 0
+                for base_idx in range(n_base):
+                    if missing[base_idx] > missing[b1]:
+                        b1 = base_idx
+                if missing[b1] == 0:
+                    break
+                s1 = s2 = -1
+                for word in range(n_words):
+                    if s1 < 0 and frog_table[b1, word]:
+                        s1 = word * 64 + lowest_bit(frog_table[b1, word])
+                    if s2 < 0 and complete_row[word] & ~frog_table[b1, word]:
+                        s2 = word * 64 + lowest_bit(complete_row[word] & ~frog_table[b1, word])
+                b2 = 0
+                while not has_frog(frog_table, b2, s2):
+                    b2 += 1
+
+            # Breed the pair until one of its missing targets lands. Bit 0 picks frog_1's base color, bit 1
+            # frog_1's secondary color, as in the pair schedule kernels.
+            while True:
+                bits = random_bits_numba(bit_buffer, 2) if even_odds else offspring_code(bit_buffer)
+                total_breeds += 1
+                if bits == np.uint64(1) and not has_frog(frog_table, b1, s2):
+                    base_idx, sec_idx = b1, s2
+                    break
+                if bits == np.uint64(2) and not has_frog(frog_table, b2, s1):
+                    base_idx, sec_idx = b2, s1
+                    break
+
+            frog_table[base_idx, sec_idx >> 6] |= np.uint64(1) << np.uint64(sec_idx & 63)
+            if record_arrivals:
+                pair_stats[new_frogs] = total_breeds
+                new_frogs += 1
+            missing[base_idx] -= 1
+            missing_secondary[sec_idx] -= 1
+            first_row, stop_row = base_idx, base_idx + 1
+
+        return total_breeds
+
+    return greedy_numba
+
+greedy_numba = register_kernel("greedy", greedy_kernel(), greedy_kernel(record_arrivals=True))
+
+@jit(nopython=True, cache=True)
+def frog_table_is_complete(frog_table, full_frog_table):
+    """Check that the table owns every frog of the palette's full table"""
+    for base_idx in range(frog_table.shape[0]):
+        for word in range(frog_table.shape[1]):
+            if frog_table[base_idx, word] != full_frog_table[base_idx, word]:
+                return False
+    return True
+
+@jit(nopython=True, cache=True)
+def is_checked(trial, validate_every):
+    """Whether a trial's final table is checked for completion"""
+    return validate_every > 0 and trial % validate_every == 0
+
+@jit(nopython=True, parallel=True, cache=True)
+def run_trials_numba(strategy, base_frog_table, full_frog_table, plan, n, n_workers, key, first_trial, pair_stats,
+                     bit_mask, validate_every):
+    """Run n trials of a strategy spread over n_workers parallel workers
+
+    Trial t draws from the random stream (key, first_trial + t) of froggycalc.rng, so a trial's result
+    does not depend on how the trials are split up.
+    pair_stats holds one accumulator per worker for instrumented strategies.
+    bit_mask is XORed into every random word (ANTITHETIC_MASK for antithetic trials).
+    Trial t's table is checked for completion when first_trial + t is a multiple of validate_every
+    (never when it is 0); unchecked trials report as completed.
+    """
+    results = np.zeros(n, dtype=np.int64)
+    completed = np.ones(n, dtype=np.bool_)
+    chunk_size = (n + n_workers - 1) // n_workers
+
+    # Each worker owns one frog table and random bit buffer, and resets the table from the base table per trial
+    for worker in prange(n_workers):
+        frog_table = np.empty_like(base_frog_table)
+        bit_buffer = new_bit_buffer()
+        bit_buffer[2] = bit_mask
+        for t in range(worker * chunk_size, min(n, (worker + 1) * chunk_size)):
+            start_stream(bit_buffer, key, np.uint64(first_trial + t))
+            frog_table[:] = base_frog_table
+            results[t] = strategy(frog_table, plan, bit_buffer, pair_stats[worker])
+            if is_checked(first_trial + t, validate_every):
+                completed[t] = frog_table_is_complete(frog_table, full_frog_table)
+
+    return results, completed
+
+@jit(nopython=True, parallel=True, cache=True)
+def run_curve_numba(strategy, base_frog_table, full_frog_table, plan, n, n_workers, key, first_trial, n_new,
+                    bin_width, n_bins, validate_every):
+    """Run n trials of a completion curve kernel and fold each trial's arrivals into the curve accumulators
+
+    Trials read their random streams as in run_trials_numba, so trial t takes the same breeds as there.
+    Returns the sums and sums of squares of the breeds at which each of the n_new new frogs landed, their
+    (n_new, n_bins) histogram over bins of bin_width breeds (the last bin holding every longer trial), and
+    the completion flags. Each worker adds into its own accumulators, so memory does not grow with n.
+    """
+    completed = np.ones(n, dtype=np.bool_)
+    breed_sums = np.zeros((n_workers, n_new), dtype=np.int64)
+    breed_squares = np.zeros((n_workers, n_new), dtype=np.int64)
+    hist = np.zeros((n_workers, n_new, n_bins), dtype=np.int64)
+    chunk_size = (n + n_workers - 1) // n_workers
+
+    for worker in prange(n_workers):
+        frog_table = np.empty_like(base_frog_table)
+        bit_buffer = new_bit_buffer()
+        arrivals = np.zeros(n_new, dtype=np.int64)
+        for t in range(worker * chunk_size, min(n, (worker + 1) * chunk_size)):
+            start_stream(bit_buffer, key, np.uint64(first_trial + t))
+            frog_table[:] = base_frog_table
+            strategy(frog_table, plan, bit_buffer, arrivals)
+            for f in range(n_new):
+                breeds = arrivals[f]
+                breed_sums[worker, f] += breeds
+                breed_squares[worker, f] += breeds * breeds
+                hist[worker, f, min(breeds // bin_width, n_bins - 1)] += 1
+            if is_checked(first_trial + t, validate_every):
+                completed[t] = frog_table_is_complete(frog_table, full_frog_table)
+
+    return breed_sums.sum(axis=0), breed_squares.sum(axis=0), hist.sum(axis=0), completed
+
+def run_trials(strategy, n, base_frog_table=None, n_workers=None, seed=None, first_trial=0, instrument=False,
+               antithetic=False, palette=None, validate="always"):
+    """Run n trials of a strategy (name or compiled kernel) on all cores and return the breed counts
+
+    Trial t reads the random stream (seed, first_trial + t), with a fresh seed when none is given.
+    With antithetic set, every trial runs on the antithetic twin of its usual random stream.
+    validate ("always", "sampled" or "off", see VALIDATION_STRIDES) sets which trials are checked to
+    finish the collection; a trial that does not raises AssertionError.
+    palette defaults to PALETTE; base_frog_table defaults to the palette's color wheel frogs. Any partial
+    collection that includes the color wheel frogs can be the start table; pair schedule strategies skip
+    the pairs it already completes.
+
+    With instrument set, the strategy must be given by name, and a (2, n_frogs, n_frogs) array with the
+    sum and sum of squares of the breeds performed on each wheel pair (i, j) across trials is returned
+    along with the breed counts.
+    """
+    validate_every = validation_stride(validate)
+    if isinstance(strategy, str):
+        if instrument:
+            if strategy not in INSTRUMENTED_STRATEGIES:
+                raise ValueError(f"Strategy {strategy!r} has no instrumented kernel")
+            strategy = INSTRUMENTED_STRATEGIES[strategy]
+        else:
+            strategy = get_strategy(strategy)
+    elif instrument:
+        raise ValueError("Instrumented runs need the strategy's registered name")
+    if palette is None:
+        palette = PALETTE
+    if base_frog_table is None:
+        base_frog_table = create_frog_table(palette)
+    if n_workers is None:
+        n_workers = get_num_threads()
+    n_workers = max(1, min(n_workers, n))
+
+    plan = palette_plan(palette)
+    if strategy in PAIR_SCHEDULE_KERNELS:
+        plan = remaining_plan(plan, base_frog_table)
+
+    n_pair_frogs = len(palette.color_wheel_indices) if instrument else 0
+    pair_stats = np.zeros((n_workers, 2, n_pair_frogs, n_pair_frogs), dtype=np.int64)
+    key = stream_key(fresh_seed() if seed is None else seed)
+    results, completed = run_trials_numba(
+        strategy, base_frog_table, full_frog_table(palette), plan, n, n_workers, key, first_trial, pair_stats,
+        ANTITHETIC_MASK if antithetic else np.uint64(0), validate_every
+    )
+
+    # Validate that we got every frog of the palette
+    if not completed.all():
+        raise AssertionError(f"Trial {first_trial + np.argmin(completed)} does not get every single breed")
+
+    if instrument:
+        return results, pair_stats.sum(axis=0)
+    return results
+
+@jit(nopython=True, parallel=True, cache=True)
+def run_cases_numba(strategy, base_frog_tables, full_frog_table, plans, rules, n, n_workers, key, validate_every):
+    """Run n trials of a strategy for each case (starting table base_frog_tables[c], breeding plan plans[c],
+    inheritance rule thresholds rules[c]) in one parallel call
+
+    Trial t of every case reads the random stream (key, t), so cases are compared on common random numbers.
+    Trial t of every case is checked for completion when t is a multiple of validate_every, as in run_trials_numba.
+    """
+    n_cases = len(plans)
+    results = np.zeros((n_cases, n), dtype=np.int64)
+    completed = np.ones((n_cases, n), dtype=np.bool_)
+    n_jobs = n_cases * n
+    chunk_size = (n_jobs + n_workers - 1) // n_workers
+
+    for worker in prange(n_workers):
+        frog_table = np.empty_like(base_frog_tables[0])
+        bit_buffer = new_bit_buffer()
+        pair_stats = np.zeros((2, 0, 0), dtype=np.int64)
+        for job in range(worker * chunk_size, min(n_jobs, (worker + 1) * chunk_size)):
+            c, t = job // n, job % n
+            start_stream(bit_buffer, key, np.uint64(t))
+            bit_buffer[3] = rules[c, 0]
+            bit_buffer[4] = rules[c, 1]
+            frog_table[:] = base_frog_tables[c]
+            results[c, t] = strategy(frog_table, plans[c], bit_buffer, pair_stats)
+            if is_checked(t, validate_every):
+                completed[c, t] = frog_table_is_complete(frog_table, full_frog_table)
+
+    return results, completed
+
+def run_cases(strategy, base_frog_tables, plans, n, seed, n_workers, palette, validate="always", rules=None):
+    """Run run_cases_numba on all cores and check that the validated trials finished the collection
+
+    rules holds one inheritance_rule per case; every case breeds at even odds without it.
+    """
+    validate_every = validation_stride(validate)
+    if rules is None:
+        rules = np.repeat(inheritance_rule()[None], len(plans), axis=0)
+    if isinstance(strategy, str):
+        strategy = get_strategy(strategy)
+    if n_workers is None:
+        n_workers = get_num_threads()
+    n_workers = max(1, min(n_workers, len(plans) * n))
+
+    results, completed = run_cases_numba(strategy, np.ascontiguousarray(base_frog_tables), full_frog_table(palette),
+                                         np.ascontiguousarray(plans), np.ascontiguousarray(rules, dtype=np.uint64),
+                                         n, n_workers, stream_key(seed), validate_every)
+    if not completed.all():
+        c, t = np.unravel_index(np.argmin(completed), completed.shape)
+        raise AssertionError(f"Trial {t} of case {c} does not get every single breed")
+    return results
+
+def score_wheels(strategy, wheels, n, seed=0, base_frog_table=None, n_workers=None, palette=None, validate="always"):
+    """Breed counts of n common-random-number trials for each (n_frogs, 2) wheel in wheels, shape (len(wheels), n)"""
+    if palette is None:
+        palette = PALETTE
+    if base_frog_table is None:
+        base_frog_table = create_frog_table(palette)
+    plans = np.array([build_plan(wheel, len(palette.secondary_colors)) for wheel in wheels])
+    base_frog_tables = np.repeat(base_frog_table[None], len(plans), axis=0)
+    return run_cases(strategy, base_frog_tables, plans, n, seed, n_workers, palette, validate)
+
+def run_states(strategy, base_frog_tables, n, seed=0, n_workers=None, palette=None, validate="always"):
+    """Breed counts of n common-random-number trials starting from each of a stack of frog tables,
+    shape (len(base_frog_tables), n)
+    """
+    if palette is None:
+        palette = PALETTE
+    plans = np.repeat(palette_plan(palette)[None], len(base_frog_tables), axis=0)
+    return run_cases(strategy, base_frog_tables, plans, n, seed, n_workers, palette, validate)
+
+def print_pair_costs(pair_stats, n, top=10, palette=None):
+    """Print the wheel pairs that take the most breeds on average"""
+    color_wheel = (PALETTE if palette is None else palette).color_wheel
+    mean = pair_stats[0] / n
+    std = np.sqrt(np.maximum(pair_stats[1] / n - mean ** 2, 0))
+    order = np.argsort(mean, axis=None)[::-1][:top]
+    print(f"\nMost expensive color wheel pairs ({n} trials):")
+    for i, j in zip(*np.unravel_index(order, mean.shape)):
+        frog_1 = " ".join(color_wheel[i])
+        frog_2 = " ".join(color_wheel[j])
+        print(f"  {frog_1:>16} x {frog_2:<16} {mean[i, j]:6.2f} +/- {std[i, j]:.2f} breeds")
+
+def save_pair_costs(pair_stats, n, path, palette=None):
+    """Write the mean and standard deviation of the breeds spent on every wheel pair to a CSV file"""
+    color_wheel = (PALETTE if palette is None else palette).color_wheel
+    mean = pair_stats[0] / n
+    std = np.sqrt(np.maximum(pair_stats[1] / n - mean ** 2, 0))
+    with open(path, "w") as f:
+        f.write("frog_1,frog_2,mean_breeds,std_breeds\n")
+        for i in range(len(color_wheel)):
+            for j in range(i + 1, len(color_wheel)):
+                f.write(f"{' '.join(color_wheel[i])},{' '.join(color_wheel[j])},{mean[i, j]:.6f},{std[i, j]:.6f}\n")
+
+def warm_up(strategies=None, instrument=False, curve=False, cases=False):
+    """Compile every kernel the runners need, or load it from numba's on-disk cache, and return the seconds it took
+
+    instrument, curve and cases also compile the instrumented, completion curve and batched case
+    (run_cases) kernels.
+    """
+    start_time = time.time()
+    base_frog_table = create_frog_table()
+    for name in STRATEGIES if strategies is None else strategies:
+        run_trials(name, 1, base_frog_table, n_workers=1)
+        if cases:
+            score_wheels(name, color_wheel_indices[None], 1, n_workers=1)
+        if instrument and name in INSTRUMENTED_STRATEGIES:
+            run_trials(name, 1, base_frog_table, n_workers=1, instrument=True)
+        if curve and name in CURVE_STRATEGIES:
+            run_curve(name, 1, base_frog_table, bin_width=1, n_workers=1)
+    return time.time() - start_time
+
+def run_until_precision(strategy, target_half_width, confidence=0.95, batch_size=10000, max_trials=None,
+                        base_frog_table=None, seed=None, palette=None, validate="always"):
+    """Run batches of trials until the confidence interval on the mean is at most target_half_width wide
+
+    Returns the streaming summary (count, mean, M2, min, max), the half-width reached and the breed count histogram.
+    """
+    if not target_half_width > 0:
+        raise ValueError("The target half-width must be positive")
+    if batch_size < 1:
+        raise ValueError("Batches need at least one trial")
+    # Every batch continues the same run's streams
+    seed = fresh_seed() if seed is None else seed
+    stats = summarize([])
+    hist = histogram([])
+    half_width = np.inf
+    next_batch = batch_size
+    while half_width > target_half_width:
+        if max_trials is not None:
+            next_batch = min(next_batch, max_trials - int(stats[0]))
+            if next_batch <= 0:
+                break
+
+        results = run_trials(strategy, next_batch, base_frog_table, seed=seed, first_trial=int(stats[0]),
+                             palette=palette, validate=validate)
+        stats = merge_stats(stats, summarize(results))
+        hist = merge_histograms(hist, histogram(results))
+        half_width = confidence_half_width(stats, confidence)
+
+        # Jump straight to the number of trials the current variance estimate says is needed, topping
+        # up in small batches once the estimate is reached so the target is not overshot much. The
+        # variance needs two trials; until then, run another batch.
+        if stats[0] < 2:
+            next_batch = batch_size
+            continue
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        needed = int(np.ceil(z ** 2 * stats[2] / (stats[0] - 1) / target_half_width ** 2))
+        next_batch = max(needed - int(stats[0]), batch_size // 10, 1)
+
+    return stats, half_width, hist
+
+def run_histogram(strategy, n, base_frog_table=None, batch_size=1_000_000, seed=None, first_trial=0, palette=None,
+                  validate="always"):
+    """Histogram of the breed counts of n trials, run in batches so memory stays bounded however large n is"""
+    seed = fresh_seed() if seed is None else seed
+    hist = histogram([])
+    for first in range(0, n, batch_size):
+        results = run_trials(strategy, min(batch_size, n - first), base_frog_table, seed=seed,
+                             first_trial=first_trial + first, palette=palette, validate=validate)
+        hist = merge_histograms(hist, histogram(results))
+    return hist
+
+def run_curve(strategy, n, base_frog_table=None, bin_width=None, n_bins=512, batch_size=1_000_000, seed=None,
+              first_trial=0, n_workers=None, palette=None, validate="always"):
+    """Completion curve (froggycalc.curve.CompletionCurve) of n trials of a strategy in CURVE_STRATEGIES
+
+    Trials take the same breeds as run_trials with the same seed and first_trial, in batches of batch_size.
+    Without a bin_width, a 64 trial pilot run sets it so that the n_bins bins span about twice the mean
+    breeds performed to finish the collection.
+    """
+    if strategy not in CURVE_STRATEGIES:
+        raise ValueError(f"Strategy {strategy!r} has no completion curve kernel")
+    validate_every = validation_stride(validate)
+    seed = fresh_seed() if seed is None else seed
+    if palette is None:
+        palette = PALETTE
+    if base_frog_table is None:
+        base_frog_table = create_frog_table(palette)
+    if n_bins < 1 or bin_width is not None and bin_width < 1:
+        raise ValueError("A completion curve needs at least one bin, at least one breed wide")
+    full_table = full_frog_table(palette)
+    start_frogs = int(unpack_frog_table(base_frog_table, palette).sum())
+    n_new = int(unpack_frog_table(full_table, palette).sum()) - start_frogs
+    if n_new == 0:
+        # A finished collection has no frogs left to land, and so no curve to pilot
+        bin_width = 1 if bin_width is None else bin_width
+    elif bin_width is None:
+        pilot = run_curve(strategy, 64, base_frog_table, bin_width=1, n_bins=1, seed=seed, n_workers=n_workers,
+                          palette=palette, validate="off")
+        bin_width = max(1, int(np.ceil(2 * pilot.breed_sums[-1] / pilot.trials / n_bins)))
+    if n_workers is None:
+        n_workers = get_num_threads()
+
+    kernel = CURVE_STRATEGIES[strategy]
+    plan = palette_plan(palette)
+    if kernel in PAIR_SCHEDULE_KERNELS:
+        plan = remaining_plan(plan, base_frog_table)
+
+    curve = empty_curve(start_frogs, n_new, bin_width, n_bins)
+    for first in range(0, n, batch_size):
+        batch = min(batch_size, n - first)
+        breed_sums, breed_squares, hist, completed = run_curve_numba(
+            kernel, base_frog_table, full_table, plan, batch, max(1, min(n_workers, batch)), stream_key(seed),
+            first_trial + first, n_new, bin_width, n_bins, validate_every
+        )
+        if not completed.all():
+            raise AssertionError(f"Trial {first_trial + first + np.argmin(completed)} does not get every single breed")
+        curve = merge_curves(curve, CompletionCurve(start_frogs, batch, bin_width, breed_sums, breed_squares, hist))
+    return curve
+
+def save_histogram(hist, path):
+    """Write a breed count histogram to a CSV file, one row per breed count that occurred"""
+    breeds = np.flatnonzero(hist)
+    np.savetxt(path, np.column_stack([breeds, hist[breeds]]), delimiter=",", header="breeds,trials", comments="",
+               fmt="%d")
+
+def compare_strategies(strategy_a, strategy_b, n, seed=0, antithetic=False, base_frog_table=None, palette=None,
+                       with_results=False):
+    """Per-stream breed count differences (a - b) of two strategies run on common random numbers
+
+    Trial t of both strategies reads the random stream (seed, t). With antithetic set, each stream also runs on
+    its antithetic twin and the two differences are averaged, so every returned value costs two trials per strategy.
+    With with_results set, each strategy's breed counts on the (non-antithetic) streams are returned along
+    with the differences.
+    """
+    if base_frog_table is None:
+        base_frog_table = create_frog_table(palette)
+    results_a = run_trials(strategy_a, n, base_frog_table, seed=seed, palette=palette)
+    results_b = run_trials(strategy_b, n, base_frog_table, seed=seed, palette=palette)
+    difference = results_a - results_b
+    if antithetic:
+        difference = (difference
+                      + run_trials(strategy_a, n, base_frog_table, seed=seed, antithetic=True, palette=palette)
+                      - run_trials(strategy_b, n, base_frog_table, seed=seed, antithetic=True, palette=palette)) / 2
+    if with_results:
+        return difference, results_a, results_b
+    return difference
+
+def run_comparison(strategy_a="strategy_1", strategy_b="strategy_2", n=500, seed=None, antithetic=False,
+                   confidence=0.95, palette=None):
+    """Print the paired mean difference between two strategies with its confidence interval"""
+    if seed is None:
+        seed = fresh_seed()
+    base_frog_table = create_frog_table(palette)
+    warm_up([strategy_a, strategy_b])
+
+    start_time = time.time()
+    difference, results_a, results_b = compare_strategies(strategy_a, strategy_b, n, seed, antithetic,
+                                                          base_frog_table, palette, with_results=True)
+    elapsed = time.time() - start_time
+    stats = summarize(difference)
+    half_width = confidence_half_width(stats, confidence)
+
+    # Variance of the same difference had each strategy run its trials on independent streams. Each
+    # strategy's own breed counts are independent across streams, so their variances add.
+    independent_variance = np.var(results_a, ddof=1) + np.var(results_b, ddof=1)
+    trials_per_stream = 2 if antithetic else 1
+    paired_variance = trials_per_stream * stats[2] / (stats[0] - 1)
+
+    name_a, name_b = strategy_a.replace("_", " "), strategy_b.replace("_", " ")
+    print(f"\nPaired comparison over {n} common random streams (seed {seed}"
+          f"{', antithetic' if antithetic else ''}) in {elapsed:.2f} seconds")
+    print(f"Mean difference {name_a} - {name_b}: {stats[1]:.2f} breeding events")
+    print(f"{confidence:.0%} confidence interval: {stats[1]:.2f} +/- {half_width:.3f}")
+    if paired_variance > 0:
+        print(f"Independent streams would need {independent_variance / paired_variance:.1f}x the trials "
+              f"for the same interval")
+    return stats, half_width
+
+def validate_setup(frog_table, palette=None):
+    """Validate that the setup is correct"""
+    frog_grid = unpack_frog_table(frog_table, palette)
+    # Check to make sure color wheel covers all colors
+    assert frog_grid.any(axis=1).all(), "Not all base colors covered by color wheel"
+    assert frog_grid.any(axis=0).all(), "Not all secondary colors covered by color wheel"
+    print("Setup validation passed")
+
+def run_simulation(n=500, target_half_width=None, confidence=0.95, strategies=("strategy_1", "strategy_2"),
+                   pair_costs=False, pair_costs_prefix=None, palette=None, histogram_prefix=None, validate="always",
+                   seed=None):
+    """Run the complete simulation and return (name, summary, seconds, histogram) per strategy
+
+    Breed counts are folded into an exact histogram as each batch finishes, so the full distribution
+    (quantiles and maximum) is reported without keeping every trial in memory. With histogram_prefix
+    set, each histogram is saved to <prefix>_<strategy>.csv.
+
+    With target_half_width set, each strategy runs until the confidence interval on its mean is that
+    narrow instead of running a fixed n trials. With pair_costs set, fixed n runs use the instrumented
+    kernels and report the breeds spent per color wheel pair (saved to <prefix>_<strategy>.csv when
+    pair_costs_prefix is given). validate sets which trials are checked to finish the collection
+    (see run_trials). Every strategy runs on the random streams of the same seed, which is printed so the
+    run can be reproduced; a fresh one is drawn when none is given.
+    """
+    if pair_costs and target_half_width is not None:
+        raise ValueError("Per-pair breed costs are only collected for fixed n runs")
+
+    palette = PALETTE if palette is None else palette
+    print(f"Creating frog table for the {palette.name} palette ({palette.target_count} frogs)")
+    base_frog_table = create_frog_table(palette)
+    
+    print("Validating setup")
+    validate_setup(base_frog_table, palette)
+    
+    if target_half_width is None:
+        print(f"Number of simulations per trial: {n}")
+    else:
+        print(f"Target {confidence:.0%} confidence interval half-width: {target_half_width}")
+    seed = fresh_seed() if seed is None else seed
+    print(f"Seed: {seed}")
+
+    # Compile time (or cache load time) is kept out of the strategy timings below
+    print("Warming up kernels")
+    warm_up_time = warm_up(strategies, instrument=pair_costs)
+    print(f"Warm-up took {warm_up_time:.2f} seconds")
+
+    summaries = []
+    all_pair_stats = {}
+    for strategy in strategies:
+        name = strategy.replace("_", " ")
+        print(f"Running {name}")
+        start_time = time.time()
+        if pair_costs:
+            results, all_pair_stats[strategy] = run_trials(strategy, n, base_frog_table, seed=seed, instrument=True,
+                                                           palette=palette, validate=validate)
+            hist = histogram(results)
+            stats = summarize_histogram(hist)
+        elif target_half_width is None:
+            hist = run_histogram(strategy, n, base_frog_table, seed=seed, palette=palette, validate=validate)
+            stats = summarize_histogram(hist)
+        else:
+            stats, _, hist = run_until_precision(strategy, target_half_width, confidence,
+                                                 base_frog_table=base_frog_table, seed=seed, palette=palette,
+                                                 validate=validate)
+        strategy_time = time.time() - start_time
+        print(f"Finished {name} in {strategy_time:.2f} seconds")
+        summaries.append((name, stats, strategy_time, hist))
+
+    # Print results
+    for name, stats, strategy_time, hist in summaries:
+        count, mean, m2 = stats[:3]
+        print(f"\nAverage number of breeding events for {name}: {mean:.2f}")
+        print(f"Standard deviation of breeding events for {name}: {np.sqrt(m2 / count):.2f}")
+        print(f"Breeding events {describe_distribution(hist)}")
+        if target_half_width is not None:
+            print(f"Trials run for {name}: {int(count)}")
+            print(f"{confidence:.0%} confidence interval: {mean:.2f} +/- {confidence_half_width(stats, confidence):.3f}")
+        print(f"{name.capitalize()} execution time: {strategy_time:.2f} seconds")
+
+    for strategy, pair_stats in all_pair_stats.items():
+        print_pair_costs(pair_stats, n, palette=palette)
+        if pair_costs_prefix:
+            save_pair_costs(pair_stats, n, f"{pair_costs_prefix}_{strategy}.csv", palette)
+
+    if histogram_prefix:
+        for strategy, (_, _, _, hist) in zip(strategies, summaries):
+            save_histogram(hist, f"{histogram_prefix}_{strategy}.csv")
+
+    return summaries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate frog breeding strategies")
+    parser.add_argument("-n", "--trials", type=int, default=500, help="number of trials per strategy")
+    parser.add_argument("--target-half-width", type=float, default=None,
+                        help="run each strategy until the confidence interval on its mean is this narrow")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--strategy", nargs="+", choices=list(STRATEGIES), default=["strategy_1", "strategy_2"])
+    parser.add_argument("--pair-costs", action="store_true", help="report the breeds spent per color wheel pair")
+    parser.add_argument("--pair-costs-csv", metavar="PREFIX", help="also save them to PREFIX_<strategy>.csv")
+    parser.add_argument("--histogram-csv", metavar="PREFIX",
+                        help="save each strategy's breed count histogram to PREFIX_<strategy>.csv")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare the first two strategies on common random numbers instead")
+    parser.add_argument("--antithetic", action="store_true", help="add antithetic streams to the comparison")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the trials' random streams (default: a fresh one, printed with the results)")
+    parser.add_argument("--validate", choices=list(VALIDATION_STRIDES), default="always",
+                        help="which trials are checked to finish the collection (sampled: every 64th)")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    if args.target_half_width is not None and not args.target_half_width > 0:
+        parser.error("--target-half-width must be positive")
+    if args.pair_costs or args.pair_costs_csv is not None:
+        uninstrumented = [strategy for strategy in args.strategy if strategy not in INSTRUMENTED_STRATEGIES]
+        if uninstrumented:
+            parser.error(f"no pair costs for {', '.join(uninstrumented)} "
+                         f"(choose from {', '.join(INSTRUMENTED_STRATEGIES)})")
+    palette = load_palette(args.palette)
+
+    if args.compare:
+        if len(args.strategy) != 2:
+            parser.error("--compare needs exactly two strategies")
+        run_comparison(*args.strategy, args.trials, args.seed, args.antithetic, args.confidence, palette)
+        return
+
+    run_simulation(args.trials, args.target_half_width, args.confidence, args.strategy,
+                   args.pair_costs or args.pair_costs_csv is not None, args.pair_costs_csv, palette,
+                   args.histogram_csv, args.validate, args.seed)
+
+if __name__ == "__main__":
+    # Run through the importable module so this process shares its compiled kernels (and numba's
+    # on-disk cache entries) with every other caller
+    from froggycalc.numba_engine import main
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import time
+
+import numpy as np
+
+from froggycalc.palette import load_palette
+from froggycalc.plan import PLAN_CELL_1, PLAN_CELL_2, PLAN_REDUNDANT, palette_plan
+from froggycalc.rng import CodeWindows, fresh_seed
+from froggycalc.stats import describe_distribution, histogram, merge_histograms, summarize_histogram
+from froggycalc.tables import VALIDATION_STRIDES, validation_stride
+
+# Engine for hosts without numba: no JIT, instead a batch of trials runs the pair schedule in lockstep on
+# a (trials, base, secondary) boolean state array, with the random breeds of every trial drawn in blocks.
+# Each trial reads its breeds from its own random stream (froggycalc.rng) in the order the numba kernels
+# do, so both engines give the same breed count for the same seed and trial, whatever the batch size.
+
+# Breeds drawn per trial at a time while a pair is open. Two missing targets take about 6 breeds on
+# average, so most pairs close within the first block.
+DRAW_BLOCK = 16
+
+# Offspring codes of one breed: bit 0 takes the base color from frog 1, bit 1 the secondary color from
+# frog 1 (the same bits the numba kernels use). Only two codes give offspring the parents are not.
+FROG_1_BASE_FROG_2_SECONDARY = 1
+FROG_2_BASE_FROG_1_SECONDARY = 2
+
+
+def count_every_pair(cells, plan, k):
+    """Strategy 1: count the breeds of every pair"""
+    return np.ones(len(cells), dtype=bool)
+
+
+def count_unless_redundant(cells, plan, k):
+    """Strategy 2: skip the breeds of a pair when frog_1's secondary color is redundant"""
+    return ~(bool(plan[k, PLAN_REDUNDANT]) & cells[:, plan[k, PLAN_CELL_1]])
+
+
+# count_pair hooks by strategy name, the vectorized counterparts of the numba engine's PAIR_COUNT_RULES.
+# count_pair(cells, plan, k) gets the tables flattened to (trials, cells) and returns, per trial,
+# whether the breeds of breeding plan row k count.
+COUNT_RULES = {
+    "strategy_1": count_every_pair,
+    "strategy_2": count_unless_redundant,
+}
+
+
+def create_frog_table(palette=None):
+    """Create the (base, secondary) boolean frog table populated with the color wheel frogs"""
+    palette = load_palette() if palette is None else palette
+    frog_table = np.zeros((len(palette.base_colors), len(palette.secondary_colors)), dtype=bool)
+    frog_table[palette.color_wheel_indices[:, 0], palette.color_wheel_indices[:, 1]] = True
+    return frog_table
+
+
+def pair_breeds(need_1, need_2, streams, drawn):
+    """Breeds each trial spends on one pair, given which of the pair's two target offspring it still misses
+
+    Every other offspring is a copy of a parent, so a trial breeds until each missing target has come up.
+    The breeds are read from the trials' streams (a CodeWindows), past the drawn breeds each trial has used.
+    """
+    need_1, need_2 = need_1.copy(), need_2.copy()
+    breeds = np.zeros(len(need_1), dtype=np.int64)
+    pending = np.flatnonzero(need_1 | need_2)
+    breeds_drawn = 0
+    while len(pending):
+        draws = streams.read(pending, drawn[pending] + breeds_drawn, DRAW_BLOCK)
+        hits_1 = draws == FROG_1_BASE_FROG_2_SECONDARY
+        hits_2 = draws == FROG_2_BASE_FROG_1_SECONDARY
+
+        # Breed (1-based) at which each target came up: 0 when it was owned already, past the block when not yet
+        first_1 = np.where(hits_1.any(axis=1), hits_1.argmax(axis=1) + 1, DRAW_BLOCK + 1) * need_1[pending]
+        first_2 = np.where(hits_2.any(axis=1), hits_2.argmax(axis=1) + 1, DRAW_BLOCK + 1) * need_2[pending]
+        done_at = np.maximum(first_1, first_2)
+        done = done_at <= DRAW_BLOCK
+        breeds[pending[done]] = breeds_drawn + done_at[done]
+
+        # Targets that came up in this block are owned from now on
+        need_1[pending] &= ~hits_1.any(axis=1)
+        need_2[pending] &= ~hits_2.any(axis=1)
+        pending = pending[~done]
+        breeds_drawn += DRAW_BLOCK
+    return breeds
+
+
+def run_batch(strategy, base_frog_table, plan, seed, trials):
+    """Run trials of a strategy in lockstep over a breeding plan, returning their breed counts and final tables"""
+    count_pair = COUNT_RULES[strategy]
+    n = len(trials)
+    streams = CodeWindows(seed, trials)
+    tables = np.repeat(base_frog_table[None], n, axis=0)
+    cells = tables.reshape(n, -1)
+    total_breeds = np.zeros(n, dtype=np.int64)
+    # Breeds each trial has read from its stream
+    drawn = np.zeros(n, dtype=np.int64)
+
+    for k in range(len(plan)):
+        cell_1, cell_2 = plan[k, PLAN_CELL_1], plan[k, PLAN_CELL_2]
+        breeds = pair_breeds(~cells[:, cell_1], ~cells[:, cell_2], streams, drawn)
+        drawn += breeds
+
+        # The pair loop only stops once both targets are owned
+        cells[:, cell_1] = True
+        cells[:, cell_2] = True
+
+        total_breeds += np.where(count_pair(cells, plan, k), breeds, 0)
+
+    return total_breeds, tables
+
+
+def run_batches(strategy, n, base_frog_table=None, seed=None, batch_size=4096, palette=None, validate="always"):
+    """Run n trials of a strategy in lockstep batches of batch_size, yielding each batch's breed counts
+
+    palette defaults to the current game's palette; base_frog_table defaults to its color wheel frogs.
+    validate picks the trials checked to finish the collection, (see VALIDATION_STRIDES).
+    Trial t reads the random stream (seed, t), with a fresh seed when none is given.
+    """
+    if strategy not in COUNT_RULES:
+        raise KeyError(f"Unknown strategy {strategy!r}, NumPy engine strategies: {', '.join(COUNT_RULES)}")
+    validate_every = validation_stride(validate)
+    palette = load_palette() if palette is None else palette
+    if base_frog_table is None:
+        base_frog_table = create_frog_table(palette)
+    plan = palette_plan(palette)
+    seed = fresh_seed() if seed is None else seed
+
+    for first in range(0, n, batch_size):
+        trials = np.arange(first, min(first + batch_size, n))
+        results, tables = run_batch(strategy, base_frog_table, plan, seed, trials)
+
+        # Validate that we got every frog of the palette, on the sampled trials only
+        if validate_every:
+            checked = np.arange(-first % validate_every, len(results), validate_every)
+            completed = tables[checked].all(axis=(1, 2))
+            if not completed.all():
+                raise AssertionError(f"Trial {first + checked[np.argmin(completed)]} does not get every single breed")
+        yield results
+
+
+def run_trials(strategy, n, base_frog_table=None, seed=None, batch_size=4096, palette=None, validate="always"):
+    """Run n trials of a strategy and return the breed counts"""
+    return np.concatenate([np.zeros(0, dtype=np.int64),
+                           *run_batches(strategy, n, base_frog_table, seed, batch_size, palette, validate)])
+
+
+def run_histogram(strategy, n, base_frog_table=None, seed=None, batch_size=4096, palette=None, validate="always"):
+    """Histogram of the breed counts of n trials, folded in batch by batch so memory stays bounded"""
+    hist = histogram([])
+    for results in run_batches(strategy, n, base_frog_table, seed, batch_size, palette, validate):
+        hist = merge_histograms(hist, histogram(results))
+    return hist
+
+
+def run_simulation(n=500, strategies=("strategy_1", "strategy_2"), seed=None, batch_size=4096, palette=None,
+                   validate="always"):
+    """Run the complete simulation and return (name, summary, seconds, histogram) per strategy"""
+    palette = load_palette() if palette is None else palette
+    print(f"Creating frog table for the {palette.name} palette ({palette.target_count} frogs)")
+    base_frog_table = create_frog_table(palette)
+    print(f"Number of simulations per trial: {n}")
+    seed = fresh_seed() if seed is None else seed
+    print(f"Seed: {seed}")
+
+    summaries = []
+    for strategy in strategies:
+        name = strategy.replace("_", " ")
+        print(f"Running {name}")
+        start_time = time.time()
+        hist = run_histogram(strategy, n, base_frog_table, seed, batch_size, palette, validate)
+        stats = summarize_histogram(hist)
+        strategy_time = time.time() - start_time
+        print(f"Finished {name} in {strategy_time:.2f} seconds")
+        summaries.append((name, stats, strategy_time, hist))
+
+    for name, stats, strategy_time, hist in summaries:
+        count, mean, m2 = stats[:3]
+        print(f"\nAverage number of breeding events for {name}: {mean:.2f}")
+        print(f"Standard deviation of breeding events for {name}: {np.sqrt(m2 / count):.2f}")
+        print(f"Breeding events {describe_distribution(hist)}")
+        print(f"{name.capitalize()} execution time: {strategy_time:.2f} seconds")
+
+    return summaries
+
+
+# Options of `froggycalc simulate` that only the numba engine has, named when simulate falls back to this engine
+NUMBA_ONLY_OPTIONS = ("--target-half-width", "--confidence", "--pair-costs", "--pair-costs-csv", "--histogram-csv",
+                      "--compare", "--antithetic")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate frog breeding strategies with the NumPy engine (no numba)")
+    parser.add_argument("-n", "--trials", type=int, default=500, help="number of trials per strategy")
+    parser.add_argument("--strategy", nargs="+", choices=list(COUNT_RULES), default=["strategy_1", "strategy_2"])
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the trials' random streams (default: a fresh one, printed with the results)")
+    parser.add_argument("--batch-size", type=int, default=4096, help="trials run in lockstep at a time")
+    parser.add_argument("--validate", choices=list(VALIDATION_STRIDES), default="always",
+                        help="which trials are checked to finish the collection (sampled: every 64th)")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args, unknown = parser.parse_known_args(argv)
+    numba_only = [option for option in NUMBA_ONLY_OPTIONS
+                  if any(arg == option or arg.startswith(f"{option}=") for arg in unknown)]
+    if numba_only:
+        parser.error(f"only the numba engine (froggycalc simulate with numba installed) has {', '.join(numba_only)}")
+    if unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+
+    run_simulation(args.trials, args.strategy, args.seed, args.batch_size, load_palette(args.palette), args.validate)
+
+
+if __name__ == "__main__":
+    main()
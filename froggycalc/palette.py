@@ -0,0 +1,64 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_PALETTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "palettes", "pocket_frogs.json")
+
+# Color names, the starting color wheel, and the index arrays the engines run on. target_count is the
+# number of (base, secondary) frogs a finished table owns.
+Palette = namedtuple("Palette", [
+    "name", "base_colors", "secondary_colors", "color_wheel",
+    "base_to_idx", "secondary_to_idx", "color_wheel_indices", "target_count",
+])
+
+
+def make_palette(name, base_colors, secondary_colors, color_wheel):
+    """Check a palette and compile its color wheel into index arrays"""
+    base_colors = list(base_colors)
+    secondary_colors = list(secondary_colors)
+    color_wheel = [tuple(frog) for frog in color_wheel]
+
+    # Create lookup dictionaries for O(1) index mapping
+    base_to_idx = {color: i for i, color in enumerate(base_colors)}
+    secondary_to_idx = {color: i for i, color in enumerate(secondary_colors)}
+    if len(base_to_idx) != len(base_colors) or len(secondary_to_idx) != len(secondary_colors):
+        raise ValueError(f"Palette {name!r} lists a color twice")
+    for base, secondary in color_wheel:
+        if base not in base_to_idx or secondary not in secondary_to_idx:
+            raise ValueError(f"Color wheel of {name!r} contains invalid frog color {base} {secondary}")
+
+    color_wheel_indices = np.array([
+        (base_to_idx[base], secondary_to_idx[secondary])
+        for base, secondary in color_wheel
+    ], dtype=np.int32).reshape(-1, 2)
+
+    return Palette(name, base_colors, secondary_colors, color_wheel, base_to_idx, secondary_to_idx,
+                   color_wheel_indices, len(base_colors) * len(secondary_colors))
+
+
+def load_palette(path=None):
+    """Load a palette JSON file (default: the current game's palette)"""
+    path = DEFAULT_PALETTE if path is None else path
+    with open(path) as f:
+        data = json.load(f)
+    return make_palette(data.get("name", os.path.basename(path)), data["base_colors"],
+                        data["secondary_colors"], data["color_wheel"])
+
+
+@lru_cache(maxsize=None)
+def default_palette():
+    """The current game's palette, loaded once per process and shared by every module"""
+    return load_palette()
+
+
+def synthetic_palette(n_base, n_secondary):
+    """Hypothetical palette for scaling studies: one wheel frog per base color, secondaries dealt round-robin"""
+    if n_base < n_secondary:
+        raise ValueError("A synthetic palette needs at least as many base colors as secondary colors")
+    base_colors = [f"Base{i}" for i in range(n_base)]
+    secondary_colors = [f"Secondary{i}" for i in range(n_secondary)]
+    color_wheel = [(base_colors[i], secondary_colors[i % n_secondary]) for i in range(n_base)]
+    return make_palette(f"synthetic {n_base}x{n_secondary}", base_colors, secondary_colors, color_wheel)
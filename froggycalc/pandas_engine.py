@@ -0,0 +1,160 @@
+import argparse
+import random
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from froggycalc.palette import load_palette
+from froggycalc.plan import PLAN_I, PLAN_J, PLAN_REDUNDANT, build_plan
+from froggycalc.rng import fresh_seed, trial_codes
+
+# Palette and color wheel shared with the numba engine (palettes/pocket_frogs.json)
+palette = load_palette()
+base_colors = palette.base_colors
+secondary_colors = palette.secondary_colors
+color_wheel = palette.color_wheel
+
+@lru_cache(maxsize=None)
+def _wheel_plan(color_wheel):
+    base_idx = {base: i for i, base in enumerate(dict.fromkeys(base for base, _ in color_wheel))}
+    secondary_idx = {sec: i for i, sec in enumerate(dict.fromkeys(sec for _, sec in color_wheel))}
+    indices = [(base_idx[base], secondary_idx[sec]) for base, sec in color_wheel]
+    return build_plan(indices, len(secondary_idx))
+
+def wheel_plan(color_wheel: list):
+    # Breeding plan of a color wheel given by color names, built once per wheel
+    # The table is indexed by name, so the strategies only use the plan's pair order and redundancy flags
+    return _wheel_plan(tuple(tuple(frog) for frog in color_wheel))
+
+def breed_pair(frog_1: tuple, frog_2: tuple, codes=None):
+    # Function to create random offspring from 2 frogs
+    # With codes (a trial's offspring codes, see froggycalc.rng) the offspring is the next code's,
+    # bit 0 taking frog_1's base color and bit 1 frog_1's secondary color, as in the other engines
+    if codes is not None:
+        code = next(codes)
+        return (frog_1[0] if code & 1 else frog_2[0], frog_1[1] if code & 2 else frog_2[1])
+    base_colors = [frog_1[0], frog_2[0]]
+    secondary_colors = [frog_1[1], frog_2[1]]
+    return (base_colors[random.randint(0, 1)], secondary_colors[random.randint(0, 1)])
+
+# In this strategy we will go through the color wheel and breed each frog with every other frog
+# We will continue breeding until we get the 2 unique offspring for that pair
+# If the offspring are redundant (i.e. breeding Maroon Tingo with Red Tingo) we will just move on
+# If we already have the offspring from a previous breeding, we move on
+def strategy_1(frog_table: pd.DataFrame, color_wheel: list, codes=None):
+    total_breeds = 0
+
+    # Loop across every pair of the color wheel, each frog with every other frog in the wheel ahead of it
+    for i, j in wheel_plan(color_wheel)[:, [PLAN_I, PLAN_J]]:
+        frog_1, frog_2 = color_wheel[i], color_wheel[j]
+        num_breeds = 0  # breeding events for this specific pair
+        base_1, secondary_1 = frog_1
+        base_2, secondary_2 = frog_2
+        # Check if the 2 unique offspring are in the table
+        while not (frog_table.loc[base_1, secondary_2] and frog_table.loc[base_2, secondary_1]):
+            # Breed frogs, and update table 
+            offspring_base, offspring_secondary = breed_pair(frog_1, frog_2, codes)
+            frog_table.loc[offspring_base, offspring_secondary] = True
+            num_breeds += 1
+
+        total_breeds += num_breeds
+
+    assert frog_table.values.all(), "Strategy does not get every single breed"
+
+    return total_breeds
+
+
+# Strategy is very similar to strategy_1 with one exception
+# For a frog with a redundant base colors in our color wheel, i.e. Maroon Tingo and Red Tingo,
+# if we get the first frog's base color with the other frog's secondary color, we move on 
+# since the first frog's secondary color with the other frog's base will be achieved with the redundant color wheel frog
+# As an example:
+# When breeding Maroon Tingo with Purple Pruni, we want Maroon Pruni and Purple Tingo
+# if, by luck/chance, we get Maroon Pruni before Purple Tingo, we just move on
+# this is because we will get Purple Tingo when we breed Red Tingo with Purple Pruni
+# so in theory we are using the good luck of the first breeding
+def strategy_2(frog_table: pd.DataFrame, color_wheel: list, codes=None):
+    total_breeds = 0
+
+    # Loop across every pair of the color wheel, each frog with every other frog in the wheel ahead of it
+    # The plan flags the frogs whose secondary color is redundant (comes up again later in the wheel)
+    for i, j, secondary_is_redundant in wheel_plan(color_wheel)[:, [PLAN_I, PLAN_J, PLAN_REDUNDANT]]:
+        frog_1, frog_2 = color_wheel[i], color_wheel[j]
+        num_breeds = 0  # breeding events for this specific pair
+        base_1, secondary_1 = frog_1
+        base_2, secondary_2 = frog_2
+        # Check if the 2 unique offspring are in the table
+        while not (frog_table.loc[base_1, secondary_2] and frog_table.loc[base_2, secondary_1]):
+            # Breed frogs, and update table 
+            offspring_base, offspring_secondary = breed_pair(frog_1, frog_2, codes)
+            frog_table.loc[offspring_base, offspring_secondary] = True
+            num_breeds += 1
+
+        # If frog_1's secondary is redundant, and we got frog_2's secondary color we can quit early
+        if secondary_is_redundant and frog_table.loc[base_1, secondary_2]:
+            continue
+
+        total_breeds += num_breeds
+
+    assert frog_table.values.all(), "Strategy does not get every single breed"
+
+    return total_breeds
+
+
+def create_frog_table(palette=palette):
+    # Create empty table, True represents we have the frog, False if we don't
+    # Populate with the color wheel
+    frog_table = pd.DataFrame(False, index=palette.base_colors, columns=palette.secondary_colors)
+    for frog in palette.color_wheel:
+        base, secondary = frog
+        if base not in palette.base_to_idx or secondary not in palette.secondary_to_idx:
+            raise Exception("Color wheel contains invalid frog color")
+        frog_table.loc[base, secondary] = True
+
+    # Check to make sure color wheel covers all colors
+    assert 0 not in frog_table.sum(axis=1).values, "Not all base colors covered by color wheel"
+    assert 0 not in frog_table.sum(axis=0).values, "Not all secondary colors covered by color wheel"
+
+    return frog_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate frog breeding strategies with the original pandas engine")
+    parser.add_argument("-n", "--trials", type=int, default=500, help="number of trials per strategy")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the trials' random streams (default: a fresh one, printed with the results)")
+    args = parser.parse_args(argv)
+
+    print("Creating frog table")
+    frog_table = create_frog_table()
+
+    # Run n trials for the strategy to determine average number of events needed
+    n = args.trials
+    print(f"Number of simulations per trial: {n}")
+    # Trial i reads the random stream (seed, i), the same one the other engines give trial i
+    seed = fresh_seed() if args.seed is None else args.seed
+    print(f"Seed: {seed}")
+
+    print("Running strategy 1")
+    strategy_1_results = np.zeros(n)
+    for i in range(0, n):
+        strategy_1_results[i] = strategy_1(frog_table.copy(), color_wheel, trial_codes(seed, i))
+    print("Finished strategy 1")
+
+    print("Running strategy 2")
+    strategy_2_results = np.zeros(n)
+    for i in range(0, n):
+        strategy_2_results[i] = strategy_2(frog_table.copy(), color_wheel, trial_codes(seed, i))
+    print("Finished strategy 2")
+
+    print(f"Average number of breeding events for strategy 1: {np.mean(strategy_1_results):.2f}")
+    print(f"Standard deviation of breeding events for strategy 1: {np.std(strategy_1_results):.2f}\n")
+
+    print(f"Average number of breeding events for strategy 2: {np.mean(strategy_2_results):.2f}")
+    print(f"Standard deviation of breeding events for strategy 2: {np.std(strategy_2_results):.2f}\n")
+
+
+# --------------#
+if __name__ == "__main__":
+    main()
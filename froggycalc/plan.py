@@ -0,0 +1,62 @@
+import numpy as np
+
+# A breeding plan is the pair schedule of a color wheel compiled once, before any trial runs: one row per
+# pair operation (i, j), in the order the strategies breed them, holding everything a trial needs to look
+# up about the pair. Pair (i, j) has two target offspring, target 1 = (frog i's base, frog j's secondary)
+# and target 2 = (frog j's base, frog i's secondary); every other offspring is a copy of a parent.
+PLAN_I = 0
+PLAN_J = 1
+# 1 when frog i's secondary color comes up again later in the wheel
+PLAN_REDUNDANT = 2
+# Target cells as flat indices into a (base, secondary) boolean grid
+PLAN_CELL_1 = 3
+PLAN_CELL_2 = 4
+# Target cells as flat word indices into a bitset frog table, and their bit within that word
+PLAN_WORD_1 = 5
+PLAN_WORD_2 = 6
+PLAN_BIT_1 = 7
+PLAN_BIT_2 = 8
+PLAN_FIELDS = 9
+
+
+def words_per_row(n_secondary):
+    """64-bit words in one bitset frog table row"""
+    return (n_secondary + 63) // 64
+
+
+def build_plan(color_wheel_indices, n_secondary):
+    """Compile a color wheel's pair schedule into an (n_pairs, PLAN_FIELDS) int64 plan"""
+    color_wheel_indices = np.asarray(color_wheel_indices, dtype=np.int64)
+    base, secondary = color_wheel_indices[:, 0], color_wheel_indices[:, 1]
+    i, j = np.triu_indices(len(color_wheel_indices), 1)
+    redundant = np.triu(secondary[:, None] == secondary[None, :], 1).any(axis=1)
+    n_words = words_per_row(n_secondary)
+
+    plan = np.empty((len(i), PLAN_FIELDS), dtype=np.int64)
+    plan[:, PLAN_I] = i
+    plan[:, PLAN_J] = j
+    plan[:, PLAN_REDUNDANT] = redundant[i]
+    plan[:, PLAN_CELL_1] = base[i] * n_secondary + secondary[j]
+    plan[:, PLAN_CELL_2] = base[j] * n_secondary + secondary[i]
+    plan[:, PLAN_WORD_1] = base[i] * n_words + (secondary[j] >> 6)
+    plan[:, PLAN_WORD_2] = base[j] * n_words + (secondary[i] >> 6)
+    plan[:, PLAN_BIT_1] = secondary[j] & 63
+    plan[:, PLAN_BIT_2] = secondary[i] & 63
+    return plan
+
+
+def palette_plan(palette):
+    """The breeding plan of a palette's own color wheel"""
+    return build_plan(palette.color_wheel_indices, len(palette.secondary_colors))
+
+
+def remaining_plan(plan, frog_table):
+    """The rows of a plan whose pair still misses a target offspring in a bitset frog table
+
+    A pair that owns both targets breeds nothing and draws no random bits, so dropping it leaves the
+    results of the pair schedule strategies unchanged, trial for trial.
+    """
+    words = np.ascontiguousarray(frog_table, dtype=np.uint64).reshape(-1)
+    owned_1 = (words[plan[:, PLAN_WORD_1]] >> plan[:, PLAN_BIT_1].astype(np.uint64)) & np.uint64(1)
+    owned_2 = (words[plan[:, PLAN_WORD_2]] >> plan[:, PLAN_BIT_2].astype(np.uint64)) & np.uint64(1)
+    return plan[(owned_1 == 0) | (owned_2 == 0)]
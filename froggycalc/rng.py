@@ -0,0 +1,120 @@
+import numpy as np
+
+# Counter-based random streams shared by every engine. Trial k of a run with seed s reads its own stream
+# of 64-bit words, word w being half of the Philox4x32-10 block (counter (w // 2, k), key s). There is no
+# generator state to carry from one draw to the next, so any word of any trial's stream is computed
+# directly: trials give the same results whatever thread, shard or engine runs them, and a single trial
+# of a large run can be replayed on its own.
+#
+# Breeds are read from the stream as 2-bit offspring codes, lowest bits first: breed b of a trial is
+# bits 2 * (b % 32) and up of word b // 32. Bit 0 is set when the offspring takes frog_1's base color,
+# bit 1 when it takes frog_1's secondary color.
+
+# Philox4x32 multipliers and Weyl key increments (Salmon et al., "Parallel random numbers: as easy as 1, 2, 3")
+PHILOX_M0 = np.uint64(0xD2511F53)
+PHILOX_M1 = np.uint64(0xCD9E8D57)
+PHILOX_W0 = np.uint64(0x9E3779B9)
+PHILOX_W1 = np.uint64(0xBB67AE85)
+PHILOX_ROUNDS = 10
+
+MASK_32 = np.uint64(0xFFFFFFFF)
+SHIFT_32 = np.uint64(32)
+
+# 2-bit breed codes per 64-bit word, and per Philox block of two words
+CODES_PER_WORD = 32
+CODES_PER_BLOCK = 64
+
+
+def philox4x32(c0, c1, c2, c3, k0, k1):
+    """Philox4x32-10 block of the 128-bit counter (c0, c1, c2, c3) under the 64-bit key (k0, k1), as four
+    32-bit lanes
+
+    Every argument is a uint64 holding a 32-bit lane, or a uint64 array of them. The numba engine
+    compiles this same function for its kernels.
+    """
+    for _ in range(PHILOX_ROUNDS):
+        p0 = c0 * PHILOX_M0
+        p1 = c2 * PHILOX_M1
+        c0, c1, c2, c3 = (p1 >> SHIFT_32) ^ c1 ^ k0, p1 & MASK_32, (p0 >> SHIFT_32) ^ c3 ^ k1, p0 & MASK_32
+        k0 = (k0 + PHILOX_W0) & MASK_32
+        k1 = (k1 + PHILOX_W1) & MASK_32
+    return c0, c1, c2, c3
+
+
+def stream_key(seed):
+    """A seed as the uint64 Philox key of its streams (any integer, taken modulo 2 ** 64)"""
+    return np.uint64(int(seed) % 2 ** 64)
+
+
+def fresh_seed():
+    """A new seed for a run that was not given one, small enough to type back in to reproduce it"""
+    return int(np.random.SeedSequence().entropy % 2 ** 31)
+
+
+def random_blocks(seed, trials, blocks):
+    """Philox blocks of the streams of trials under seed, as words 2 * block and 2 * block + 1 along a new
+    last axis; trials and blocks broadcast against each other
+    """
+    key = stream_key(seed)
+    trials = np.asarray(trials, dtype=np.uint64)
+    blocks = np.asarray(blocks, dtype=np.uint64)
+    x0, x1, x2, x3 = philox4x32(blocks & MASK_32, blocks >> SHIFT_32, trials & MASK_32, trials >> SHIFT_32,
+                                key & MASK_32, key >> SHIFT_32)
+    return np.stack([(x1 << SHIFT_32) | x0, (x3 << SHIFT_32) | x2], axis=-1)
+
+
+def random_words(seed, trials, indices):
+    """Words indices of the streams of trials under seed; trials and indices broadcast against each other"""
+    indices = np.asarray(indices, dtype=np.uint64)
+    words = random_blocks(seed, trials, indices >> np.uint64(1))
+    return np.where(indices & np.uint64(1), words[..., 1], words[..., 0])
+
+
+def word_codes(words):
+    """Split uint64 words into their 2-bit offspring codes, in stream order, along the last axis"""
+    # Little-endian bytes put every word's low bits first, 4 codes to a byte
+    word_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    codes = (word_bytes[..., None] >> np.arange(0, 8, 2, dtype=np.uint8)) & np.uint8(3)
+    return codes.reshape(*words.shape[:-1], -1)
+
+
+class CodeWindows:
+    """Offspring codes of a batch of trials, read through one window of the stream per trial
+
+    A window that a read runs past is refilled from that trial's read position, so memory stays at
+    window codes per trial however many breeds the trials take.
+    """
+
+    def __init__(self, seed, trials, window=2048):
+        self.seed = seed
+        self.trials = np.asarray(trials)
+        self.n_blocks = window // CODES_PER_BLOCK
+        self.starts = np.zeros(len(self.trials), dtype=np.int64)
+        self.codes = np.empty((len(self.trials), self.n_blocks * CODES_PER_BLOCK), dtype=np.uint8)
+        self.fill(np.arange(len(self.trials)))
+
+    def fill(self, rows):
+        first_blocks = self.starts[rows] // CODES_PER_BLOCK
+        blocks = random_blocks(self.seed, self.trials[rows, None], first_blocks[:, None] + np.arange(self.n_blocks))
+        self.codes[rows] = word_codes(blocks.reshape(len(rows), -1))
+
+    def read(self, rows, positions, count):
+        """Codes of breeds positions[i] to positions[i] + count - 1 of trial rows[i] of the batch"""
+        stale = positions + count > self.starts[rows] + self.codes.shape[1]
+        if stale.any():
+            self.starts[rows[stale]] = positions[stale] - positions[stale] % CODES_PER_BLOCK
+            self.fill(rows[stale])
+        first = rows * self.codes.shape[1] + positions - self.starts[rows]
+        return self.codes.reshape(-1).take(first[:, None] + np.arange(count))
+
+
+def trial_codes(seed, trial, chunk=64):
+    """Iterate over the offspring codes of one trial's stream, for engines that breed one frog at a time"""
+    first_word = 0
+    while True:
+        words = random_words(seed, trial, np.arange(first_word, first_word + chunk))
+        for word in words.tolist():
+            for _ in range(CODES_PER_WORD):
+                yield word & 3
+                word >>= 2
+        first_word += chunk
@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from froggycalc.numba_engine import STRATEGIES, create_frog_table, run_states, warm_up
+from froggycalc.palette import load_palette
+from froggycalc.rng import fresh_seed
+from froggycalc.stats import REPORT_QUANTILES, confidence_half_width, histogram, histogram_quantile, summarize
+
+# Answers "how many breeds are left from this collection?" over HTTP/JSON from one long-lived process, so
+# queries skip interpreter startup and JIT compilation. Queries that arrive within a short window are run
+# together in one parallel kernel call, and answers are cached by the canonical (packed) table state.
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class BreedsRemainingService:
+    """Batches breeds-remaining queries into run_states calls and caches the answers"""
+
+    def __init__(self, trials=2000, confidence=0.95, batch_window=0.005, max_batch=64, cache_size=4096,
+                 palette=None):
+        self.trials = trials
+        self.confidence = confidence
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.palette = load_palette() if palette is None else palette
+        self.cache = OrderedDict()
+        # Cache key -> future of a query that is queued or running, shared by identical queries
+        self.in_flight = {}
+        self.queue = []
+        self.wakeup = None
+        self.batches = 0
+
+    def start(self):
+        """Start the batching task; call from inside the running event loop, which the task and its event belong to"""
+        self.wakeup = asyncio.Event()
+        return asyncio.create_task(self.run_batches())
+
+    def warm_up(self):
+        """Compile (or load) every kernel a query can hit"""
+        warm_up(list(STRATEGIES))
+        for strategy in STRATEGIES:
+            run_states(strategy, create_frog_table(self.palette)[None], 1, palette=self.palette)
+
+    async def query(self, strategy, owned):
+        """Expected remaining breeds of a strategy from the color wheel plus the owned (base, secondary) frogs"""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, registered strategies: {', '.join(STRATEGIES)}")
+        table = create_frog_table(self.palette, owned)
+        key = (strategy, table.tobytes())
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return dict(self.cache[key], cached=True)
+        if key not in self.in_flight:
+            self.in_flight[key] = asyncio.get_running_loop().create_future()
+            self.queue.append((strategy, key, table))
+            self.wakeup.set()
+        return dict(await asyncio.shield(self.in_flight[key]), cached=False)
+
+    async def run_batches(self):
+        """Take the queued queries, waiting batch_window for more to arrive, and answer them one batch at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.wakeup.wait()
+            await asyncio.sleep(self.batch_window)
+            batch, self.queue = self.queue[:self.max_batch], self.queue[self.max_batch:]
+            if not self.queue:
+                self.wakeup.clear()
+
+            for strategy in dict.fromkeys(strategy for strategy, _, _ in batch):
+                cases = [(key, table) for s, key, table in batch if s == strategy]
+                seed = fresh_seed()
+                try:
+                    # The kernel runs in a worker thread so the event loop keeps accepting queries meanwhile
+                    results = await loop.run_in_executor(
+                        None, run_states, strategy, np.array([table for _, table in cases]), self.trials, seed,
+                        None, self.palette
+                    )
+                except Exception as error:
+                    for key, _ in cases:
+                        self.in_flight.pop(key).set_exception(error)
+                    continue
+                self.batches += 1
+
+                for (key, _), breeds in zip(cases, results):
+                    answer = self.answer(strategy, breeds)
+                    self.cache[key] = answer
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+                    self.in_flight.pop(key).set_result(answer)
+
+    def answer(self, strategy, breeds):
+        """JSON-ready answer for one query's per-trial remaining breeds"""
+        stats = summarize(breeds)
+        hist = histogram(breeds)
+        answer = {
+            "strategy": strategy,
+            "mean_remaining_breeds": float(stats[1]),
+            "half_width": float(confidence_half_width(stats, self.confidence)),
+            "confidence": self.confidence,
+            "trials": int(stats[0]),
+        }
+        for q in REPORT_QUANTILES:
+            answer[f"p{q * 100:g}"] = histogram_quantile(hist, q)
+        answer["max"] = int(stats[4])
+        return answer
+
+    def status(self):
+        return {"status": "ok", "cached_answers": len(self.cache), "queued": len(self.queue), "batches": self.batches}
+
+    async def handle(self, method, path, body):
+        """Route one request and return (status, JSON-ready response)"""
+        if path == "/health":
+            return 200, self.status()
+        if path != "/breeds-remaining":
+            return 404, {"error": f"No such endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST with a JSON body"}
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("The request body must be a JSON object")
+            owned = request.get("owned", [])
+            if not isinstance(owned, list) or not all(
+                    isinstance(frog, list) and len(frog) == 2 and all(isinstance(color, str) for color in frog)
+                    for frog in owned):
+                raise ValueError('"owned" must be a list of [base, secondary] color name pairs')
+            strategy = request.get("strategy", "strategy_1")
+            if not isinstance(strategy, str):
+                raise ValueError('"strategy" must be a strategy name')
+            return 200, await self.query(strategy, [(base, secondary) for base, secondary in owned])
+        except (ValueError, TypeError) as error:
+            return 400, {"error": str(error)}
+
+    async def serve_connection(self, reader, writer):
+        """Answer HTTP/1.1 requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, response = await self.handle(method, path, body)
+                except Exception as error:
+                    status, response = 500, {"error": str(error)}
+                payload = json.dumps(response).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8765):
+    batcher = service.start()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"Serving breeds-remaining queries on http://{host}:{port}/breeds-remaining")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve expected remaining breeds for collection states over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--trials", type=int, default=2000, help="trials per query")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0,
+                        help="how long the first query of a batch waits for more to arrive")
+    parser.add_argument("--max-batch", type=int, default=64, help="most queries run in one kernel call")
+    parser.add_argument("--cache-size", type=int, default=4096, help="answers kept, least recently used first out")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+
+    service = BreedsRemainingService(args.trials, args.confidence, args.batch_window_ms / 1000, args.max_batch,
+                                     args.cache_size, load_palette(args.palette))
+    print("Warming up kernels")
+    start_time = time.time()
+    service.warm_up()
+    print(f"Warm-up took {time.time() - start_time:.2f} seconds")
+
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from froggycalc.stats import describe_distribution, merge_histograms, merge_stats, summarize, summarize_histogram
+
+# Strategies run by every shard unless the job picks others, in report order
+DEFAULT_STRATEGIES = ("strategy_1", "strategy_2")
+
+
+def shard_range(shard, num_shards, total_trials):
+    """Return the [first, stop) global trial range covered by a shard"""
+    first = shard * total_trials // num_shards
+    stop = (shard + 1) * total_trials // num_shards
+    return first, stop
+
+
+def shard_path(out_dir, shard):
+    return os.path.join(out_dir, f"shard-{shard:06d}.npz")
+
+
+def run_shard(shard, num_shards, total_trials, seed, out_dir, threads=None, strategies=DEFAULT_STRATEGIES):
+    """Run one shard of the trial budget and write its result file"""
+    # Imported here so the merge step does not need numba
+    import numba
+    from froggycalc.numba_engine import create_frog_table, run_histogram, warm_up
+
+    if threads is not None:
+        numba.set_num_threads(threads)
+    warm_up(strategies)
+
+    first, stop = shard_range(shard, num_shards, total_trials)
+    base_frog_table = create_frog_table()
+
+    start_time = time.time()
+    stats = {}
+    for name in strategies:
+        hist = run_histogram(name, stop - first, base_frog_table, seed=seed, first_trial=first)
+        stats[name] = summarize_histogram(hist)
+        stats[f"{name}_histogram"] = hist
+    elapsed = time.time() - start_time
+
+    # Write to a temporary file first so a killed shard never leaves a partial result behind
+    path = shard_path(out_dir, shard)
+    tmp_path = path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        shard=shard, num_shards=num_shards, total_trials=total_trials, seed=seed,
+        first_trial=first, stop_trial=stop, elapsed=elapsed, strategies=np.array(strategies), **stats
+    )
+    os.replace(tmp_path, path)
+    return shard, elapsed
+
+
+def missing_shards(out_dir, num_shards):
+    return [k for k in range(num_shards) if not os.path.exists(shard_path(out_dir, k))]
+
+
+def run_local(total_trials, num_shards, seed, out_dir, processes=None, threads=None, strategies=DEFAULT_STRATEGIES):
+    """Run every shard that has no result file yet in a pool of local processes"""
+    os.makedirs(out_dir, exist_ok=True)
+    todo = missing_shards(out_dir, num_shards)
+    print(f"Running {len(todo)} of {num_shards} shards")
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(run_shard, k, num_shards, total_trials, seed, out_dir, threads, strategies)
+            for k in todo
+        ]
+        for future in as_completed(futures):
+            shard, elapsed = future.result()
+            print(f"Finished shard {shard} in {elapsed:.2f} seconds")
+
+
+def merge_shards(out_dir):
+    """Merge every shard result file in out_dir into one summary and one breed count histogram per strategy
+
+    Shards written before histograms were recorded contribute to the summaries only.
+    """
+    paths = sorted(
+        os.path.join(out_dir, name) for name in os.listdir(out_dir)
+        if name.startswith("shard-") and name.endswith(".npz") and ".tmp" not in name
+    )
+    if not paths:
+        raise FileNotFoundError(f"No shard result files found in {out_dir}")
+
+    job = None
+    seen = set()
+    merged = {}
+    histograms = {}
+    elapsed = 0.0
+    for path in paths:
+        with np.load(path) as shard:
+            strategies = tuple(str(name) for name in shard["strategies"])
+            shard_job = (int(shard["num_shards"]), int(shard["total_trials"]), int(shard["seed"]), strategies)
+            if job is None:
+                job = shard_job
+            elif shard_job != job:
+                raise ValueError(f"{path} belongs to a different job: {shard_job} != {job}")
+            seen.add(int(shard["shard"]))
+            elapsed += float(shard["elapsed"])
+            for name in strategies:
+                merged[name] = merge_stats(merged.get(name, summarize([])), shard[name])
+                if f"{name}_histogram" in shard.files:
+                    histograms[name] = merge_histograms(histograms.get(name, np.zeros(1, dtype=np.int64)),
+                                                        shard[f"{name}_histogram"])
+
+    num_shards = job[0]
+    missing = sorted(set(range(num_shards)) - seen)
+    return merged, histograms, missing, elapsed
+
+
+def print_report(merged, histograms, missing, elapsed):
+    if missing:
+        print(f"WARNING: {len(missing)} shards missing, e.g. {missing[:10]}")
+
+    for strategy, stats in merged.items():
+        name = strategy.replace("_", " ")
+        n, mean, m2 = stats[:3]
+        std = np.sqrt(m2 / n) if n else float("nan")
+        print(f"\nNumber of trials for {name}: {int(n)}")
+        print(f"Average number of breeding events for {name}: {mean:.2f}")
+        print(f"Standard deviation of breeding events for {name}: {std:.2f}")
+        if strategy in histograms:
+            if histograms[strategy].sum() < n:
+                print("WARNING: some shards have no histogram, the distribution below covers the others")
+            print(f"Breeding events {describe_distribution(histograms[strategy])}")
+
+    print(f"\nTotal shard compute time: {elapsed:.2f} seconds")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the frog simulation as independent, mergeable shards")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_job_args(p):
+        p.add_argument("--trials", type=int, required=True, help="total trial budget of the job")
+        p.add_argument("--shards", type=int, required=True, help="number of shards the budget is split into")
+        p.add_argument("--seed", type=int, default=0, help="seed of the run; trial t reads the random stream (seed, t)")
+        p.add_argument("--out", required=True, help="shared directory for shard result files")
+        p.add_argument("--threads", type=int, default=None, help="numba threads per shard process")
+        p.add_argument("--strategy", nargs="+", default=list(DEFAULT_STRATEGIES), help="registered strategy names")
+
+    run_parser = subparsers.add_parser("run", help="run selected shards in this process")
+    add_job_args(run_parser)
+    run_parser.add_argument("shard_ids", type=int, nargs="+")
+
+    local_parser = subparsers.add_parser("local", help="run all missing shards in a local process pool")
+    add_job_args(local_parser)
+    local_parser.add_argument("--processes", type=int, default=None)
+
+    merge_parser = subparsers.add_parser("merge", help="merge shard result files into one report")
+    merge_parser.add_argument("--out", required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        os.makedirs(args.out, exist_ok=True)
+        for shard in args.shard_ids:
+            if not 0 <= shard < args.shards:
+                parser.error(f"shard {shard} is outside 0..{args.shards - 1}")
+            _, elapsed = run_shard(shard, args.shards, args.trials, args.seed, args.out, args.threads, args.strategy)
+            print(f"Finished shard {shard} in {elapsed:.2f} seconds")
+    elif args.command == "local":
+        run_local(args.trials, args.shards, args.seed, args.out, args.processes, args.threads, args.strategy)
+        print_report(*merge_shards(args.out))
+    else:
+        print_report(*merge_shards(args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from statistics import NormalDist
+
+import numpy as np
+
+
+def summarize(results):
+    """Reduce per-trial breed counts to mergeable statistics (count, mean, M2, min, max)"""
+    results = np.asarray(results, dtype=np.float64)
+    if len(results) == 0:
+        return np.array([0.0, 0.0, 0.0, np.inf, -np.inf])
+    mean = results.mean()
+    m2 = np.sum((results - mean) ** 2)
+    return np.array([len(results), mean, m2, results.min(), results.max()])
+
+
+def merge_stats(a, b):
+    """Combine two summaries with Chan's parallel variance update"""
+    n_a, mean_a, m2_a, min_a, max_a = a
+    n_b, mean_b, m2_b, min_b, max_b = b
+    n = n_a + n_b
+    if n == 0:
+        return a.copy()
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return np.array([n, mean, m2, min(min_a, min_b), max(max_a, max_b)])
+
+
+def confidence_half_width(stats, confidence=0.95):
+    """Half-width of the normal confidence interval on the mean of a summary"""
+    n, _, m2 = stats[:3]
+    if n < 2:
+        return np.inf
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return z * np.sqrt(m2 / (n - 1) / n)
+
+
+# Quantiles reported next to the maximum, for planning around worst-case breeding effort
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def histogram(results):
+    """Exact histogram of per-trial breed counts: hist[k] = number of trials that took k breeds"""
+    return np.bincount(np.asarray(results, dtype=np.int64), minlength=1)
+
+
+def merge_histograms(a, b):
+    """Combine two histograms, which may cover different breed count ranges"""
+    merged = np.zeros(max(len(a), len(b)), dtype=np.int64)
+    merged[:len(a)] += a
+    merged[:len(b)] += b
+    return merged
+
+
+def histogram_quantile(hist, q):
+    """Smallest breed count whose cumulative share of the trials reaches q"""
+    cumulative = np.cumsum(hist)
+    if len(cumulative) == 0 or cumulative[-1] == 0:
+        raise ValueError("The histogram holds no trials, so it has no quantiles")
+    return int(np.searchsorted(cumulative, q * cumulative[-1]))
+
+
+def summarize_histogram(hist):
+    """The mergeable summary (count, mean, M2, min, max) of the trials in a histogram, which for an empty
+    histogram is the empty summary of summarize([]) (count 0)
+    """
+    breeds = np.flatnonzero(hist)
+    if len(breeds) == 0:
+        return summarize([])
+    counts = hist[breeds].astype(np.float64)
+    n = counts.sum()
+    mean = np.dot(counts, breeds) / n
+    m2 = np.dot(counts, (breeds - mean) ** 2)
+    return np.array([n, mean, m2, breeds[0], breeds[-1]])
+
+
+def describe_distribution(hist, quantiles=REPORT_QUANTILES):
+    """One line with the reported quantiles and the maximum of a histogram"""
+    names = " / ".join(f"p{q * 100:g}" for q in quantiles)
+    if not np.any(hist):
+        return f"{names} / max: no trials"
+    values = " / ".join(str(histogram_quantile(hist, q)) for q in quantiles)
+    return f"{names} / max: {values} / {np.flatnonzero(hist)[-1]}"
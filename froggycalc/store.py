@@ -0,0 +1,137 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from froggycalc.rng import fresh_seed
+from froggycalc.stats import describe_distribution, histogram, merge_histograms, summarize_histogram
+
+MAGIC = b"FROGRES1"
+
+# Fixed-size header at the start of every store file, followed by one compact integer per trial.
+# Trial t always reads the random stream (seed, t), so `completed` is also where the run resumes.
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("dtype", "S8"),
+    ("seed", "<i8"),
+    ("total_trials", "<i8"),
+    ("completed", "<i8"),
+    ("strategy", "S32"),
+])
+HEADER_SIZE = 128
+
+
+def create_result_store(path, strategy, total_trials, seed, dtype=np.uint16):
+    """Create an empty on-disk store for the breed counts of total_trials trials"""
+    dtype = np.dtype(dtype)
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["dtype"] = dtype.str.encode()
+    header["seed"] = seed
+    header["total_trials"] = total_trials
+    header["strategy"] = strategy.encode()
+
+    with open(path, "wb") as f:
+        f.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+        f.truncate(HEADER_SIZE + total_trials * dtype.itemsize)
+
+
+def open_result_store(path, mode="r+"):
+    """Memory-map a store file and return its header record and per-trial results array"""
+    header = np.memmap(path, dtype=HEADER_DTYPE, mode=mode, shape=(1,))
+    if header["magic"][0] != MAGIC:
+        raise ValueError(f"{path} is not a frog result store")
+    dtype = np.dtype(header["dtype"][0].decode())
+    results = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER_SIZE,
+                        shape=(int(header["total_trials"][0]),))
+    return header, results
+
+
+def run_to_store(path, strategy=None, total_trials=None, seed=None, checkpoint_every=1_000_000):
+    """Run the trials still missing from a store, checkpointing after every batch
+
+    Creates the store when it does not exist yet; otherwise resumes where the last checkpoint left off.
+    """
+    from froggycalc.numba_engine import create_frog_table, get_strategy, run_trials, warm_up
+
+    if not os.path.exists(path):
+        if strategy is None or total_trials is None:
+            raise ValueError("strategy and total_trials are needed to create a new store")
+        if seed is None:
+            seed = fresh_seed()
+        create_result_store(path, strategy, total_trials, seed)
+
+    header, results = open_result_store(path)
+    strategy = header["strategy"][0].decode()
+    seed = int(header["seed"][0])
+    total_trials = int(header["total_trials"][0])
+    kernel = get_strategy(strategy)
+    warm_up([strategy])
+    max_value = np.iinfo(results.dtype).max
+    base_frog_table = create_frog_table()
+
+    completed = int(header["completed"][0])
+    if completed:
+        print(f"Resuming {path} at trial {completed} of {total_trials}")
+
+    while completed < total_trials:
+        start_time = time.time()
+        n = min(checkpoint_every, total_trials - completed)
+        batch = run_trials(kernel, n, base_frog_table, seed=seed, first_trial=completed)
+        if batch.max() > max_value:
+            raise OverflowError(f"Breed count {batch.max()} does not fit the store's {results.dtype}")
+
+        # Results hit the disk before the checkpoint that covers them
+        results[completed:completed + n] = batch
+        results.flush()
+        completed += n
+        header["completed"] = completed
+        header.flush()
+        print(f"Checkpoint: {completed} of {total_trials} trials ({n / (time.time() - start_time):.0f} trials/sec)")
+
+    return header, results
+
+
+def summarize_store(path, chunk_size=10_000_000):
+    """Summary statistics and the breed count histogram of the completed trials of a store, read in chunks"""
+    header, results = open_result_store(path, mode="r")
+    hist = histogram([])
+    for start in range(0, int(header["completed"][0]), chunk_size):
+        stop = min(start + chunk_size, int(header["completed"][0]))
+        hist = merge_histograms(hist, histogram(results[start:stop]))
+    return header, summarize_histogram(hist), hist
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream per-trial breed counts into a resumable on-disk store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="create a store, or resume an existing one")
+    run_parser.add_argument("path")
+    run_parser.add_argument("--strategy", default="strategy_1", help="registered strategy name")
+    run_parser.add_argument("--trials", type=int, help="total trials (only used when creating the store)")
+    run_parser.add_argument("--seed", type=int, default=None)
+    run_parser.add_argument("--checkpoint-every", type=int, default=1_000_000)
+
+    summary_parser = subparsers.add_parser("summary", help="print statistics of the completed trials")
+    summary_parser.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_to_store(args.path, args.strategy, args.trials, args.seed, args.checkpoint_every)
+
+    header, stats, hist = summarize_store(args.path)
+    count, mean, m2, low, high = stats
+    print(f"\n{header['strategy'][0].decode()}: {int(count)} of {int(header['total_trials'][0])} trials complete "
+          f"(seed {int(header['seed'][0])})")
+    print(f"Average number of breeding events: {mean:.2f}")
+    print(f"Standard deviation of breeding events: {np.sqrt(m2 / count) if count else float('nan'):.2f}")
+    print(f"Min / max breeding events: {low:.0f} / {high:.0f}")
+    if count:
+        print(f"Breeding events {describe_distribution(hist)}")
+
+
+if __name__ == "__main__":
+    main()
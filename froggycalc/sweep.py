@@ -0,0 +1,144 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from froggycalc.numba_engine import STRATEGIES, inheritance_rule, run_cases, warm_up
+from froggycalc.palette import load_palette, make_palette
+from froggycalc.plan import palette_plan
+from froggycalc.stats import REPORT_QUANTILES, confidence_half_width, histogram, histogram_quantile, summarize
+from froggycalc.tables import create_frog_table
+
+# What-if studies over breeding rule variants. Every (inheritance rule, wheel) point of a strategy runs in
+# one parallel kernel call on the kernels every other runner uses, so a sweep compiles nothing new however
+# many points it has. Trial t of every point reads the random stream (seed, t), so points are compared on
+# common random numbers, and a smaller trial count reports the first trials of the largest one.
+
+COLUMNS = ["strategy", "wheel", "p_base", "p_secondary", "trials", "mean", "std", "half_width",
+           *[f"p{q * 100:g}" for q in REPORT_QUANTILES], "max"]
+
+
+def read_wheels(path):
+    """Named color wheels from a JSON file: a list of [base, secondary] pairs, named after the file, or
+    a mapping of names to such lists (what `froggycalc wheel --save` writes)
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return list(data.items())
+    return [(os.path.splitext(os.path.basename(path))[0], data)]
+
+
+def wheel_palette(palette, wheel):
+    """The palette with another starting color wheel, which must still cover every base and secondary color"""
+    wheel_palette = make_palette(palette.name, palette.base_colors, palette.secondary_colors, wheel)
+    base_idx, sec_idx = wheel_palette.color_wheel_indices.T
+    if len(set(base_idx)) < len(palette.base_colors) or len(set(sec_idx)) < len(palette.secondary_colors):
+        raise ValueError("A color wheel must cover every base and secondary color")
+    return wheel_palette
+
+
+def sweep(strategies, inheritance, trials, wheels=None, seed=0, n_workers=None, palette=None, confidence=0.95):
+    """Run every (strategy, wheel, inheritance rule, trial count) point and return the results as columns
+
+    inheritance is a list of (p_base, p_secondary) chances that an offspring takes frog_1's colors, trials
+    a list of trial counts, and wheels a list of (name, wheel) pairs, the palette's own wheel by default.
+    The table is a dict of COLUMNS to equal-length arrays, one row per point.
+    """
+    palette = load_palette() if palette is None else palette
+    if wheels is None:
+        wheels = [("default", palette.color_wheel)]
+    cases = [(name, wheel_palette(palette, wheel), rule)
+             for (name, wheel), rule in itertools.product(wheels, inheritance)]
+    n = max(trials)
+    rows = []
+
+    for strategy in strategies:
+        # Wheels of different lengths have plans of different lengths, which run in separate calls
+        by_length = {}
+        for case in cases:
+            by_length.setdefault(len(case[1].color_wheel), []).append(case)
+        for group in by_length.values():
+            results = run_cases(
+                strategy, np.array([create_frog_table(case_palette) for _, case_palette, _ in group]),
+                np.array([palette_plan(case_palette) for _, case_palette, _ in group]), n, seed, n_workers,
+                palette, rules=np.array([inheritance_rule(*rule) for _, _, rule in group]),
+            )
+            for (name, _, (p_base, p_secondary)), breeds in zip(group, results):
+                for n_trials in trials:
+                    stats = summarize(breeds[:n_trials])
+                    hist = histogram(breeds[:n_trials])
+                    rows.append([strategy, name, p_base, p_secondary, n_trials, stats[1],
+                                 np.sqrt(stats[2] / stats[0]), confidence_half_width(stats, confidence),
+                                 *[histogram_quantile(hist, q) for q in REPORT_QUANTILES], int(stats[4])])
+
+    return {column: np.array(values) for column, values in zip(COLUMNS, zip(*rows))}
+
+
+def save_table(table, path):
+    """Write a sweep's results table to a .npz file of columns, or to a CSV file for any other extension"""
+    if path.endswith(".npz"):
+        np.savez(path, **table)
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table)
+        writer.writerows(zip(*(column.tolist() for column in table.values())))
+
+
+def print_table(table):
+    """Print a sweep's results, one line per point"""
+    print(f"\n{'strategy':>12} {'wheel':>12} {'p_base':>7} {'p_sec':>7} {'trials':>9} {'mean':>9} {'+/-':>7} "
+          f"{'p50':>6} {'p99':>6} {'max':>6}")
+    for row in zip(*table.values()):
+        row = dict(zip(table, row))
+        print(f"{row['strategy']:>12} {row['wheel']:>12} {row['p_base']:>7.3f} {row['p_secondary']:>7.3f} "
+              f"{row['trials']:>9} {row['mean']:>9.2f} {row['half_width']:>7.2f} {row['p50']:>6} "
+              f"{row['p99']:>6} {row['max']:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep strategies over breeding rule variants in batched kernel calls")
+    parser.add_argument("--strategy", nargs="+", choices=list(STRATEGIES), default=["strategy_1", "strategy_2"])
+    parser.add_argument("--p-base", type=float, nargs="+", default=[0.5],
+                        help="chances that an offspring takes frog_1's base color")
+    parser.add_argument("--p-secondary", type=float, nargs="+", default=[0.5],
+                        help="chances that an offspring takes frog_1's secondary color")
+    parser.add_argument("-n", "--trials", type=int, nargs="+", default=[10000], help="trial counts per point")
+    parser.add_argument("--wheels", nargs="+", metavar="PATH", default=[],
+                        help="JSON files of color wheel variants, run next to the palette's own wheel")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    parser.add_argument("--out", metavar="PATH", help="write the results table to PATH (.npz columns, or CSV)")
+    args = parser.parse_args(argv)
+
+    palette = load_palette(args.palette)
+    wheels = [("default", palette.color_wheel)]
+    for path in args.wheels:
+        wheels += read_wheels(path)
+    inheritance = list(itertools.product(args.p_base, args.p_secondary))
+
+    print("Warming up kernels")
+    warm_up(args.strategy, cases=True)
+    start_time = time.time()
+    try:
+        table = sweep(args.strategy, inheritance, args.trials, wheels, args.seed, palette=palette,
+                      confidence=args.confidence)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.time() - start_time
+    n_points = len(args.strategy) * len(wheels) * len(inheritance)
+    print(f"Ran {n_points} points of {max(args.trials)} trials in {elapsed:.2f} seconds")
+
+    print_table(table)
+    if args.out:
+        save_table(table, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import numpy as np
+
+from froggycalc.palette import default_palette
+from froggycalc.plan import words_per_row
+
+# The frog table is one bitset row per base color, with bit s set when that base color is owned with
+# secondary s (see froggycalc.numba_engine). These helpers only need NumPy, so table states can be built
+# and hashed without loading numba.
+
+# Trials between completion checks for each validation mode: every trial, every 64th trial (numbered
+# from trial 0 of the run, so the sample does not depend on batching), or none
+VALIDATION_STRIDES = {"always": 1, "sampled": 64, "off": 0}
+
+
+def create_frog_table(palette=None, owned=()):
+    """Create and populate the initial frog table with color wheel frogs, plus any owned (base, secondary) frogs"""
+    palette = default_palette() if palette is None else palette
+    frog_grid = np.zeros((len(palette.base_colors), len(palette.secondary_colors)), dtype=bool)
+
+    # Populate with color wheel
+    for base_idx, secondary_idx in palette.color_wheel_indices:
+        frog_grid[base_idx, secondary_idx] = True
+
+    for base, secondary in owned:
+        if base not in palette.base_to_idx or secondary not in palette.secondary_to_idx:
+            raise ValueError(f"{base} {secondary} is not a frog of the {palette.name} palette")
+        frog_grid[palette.base_to_idx[base], palette.secondary_to_idx[secondary]] = True
+
+    return pack_frog_table(frog_grid)
+
+
+def full_frog_table(palette=None):
+    """The frog table of a finished collection, owning all target_count frogs of the palette"""
+    palette = default_palette() if palette is None else palette
+    return pack_frog_table(np.ones((len(palette.base_colors), len(palette.secondary_colors)), dtype=bool))
+
+
+def pack_frog_table(frog_grid):
+    """Convert a (base, secondary) boolean grid into the bitset frog table"""
+    n_base, n_secondary = frog_grid.shape
+    n_words = words_per_row(n_secondary)
+    padded = np.zeros((n_base, n_words * 64), dtype=np.uint64)
+    padded[:, :n_secondary] = frog_grid
+    weights = np.uint64(1) << np.arange(64, dtype=np.uint64)
+    return (padded.reshape(n_base, n_words, 64) * weights).sum(axis=2, dtype=np.uint64)
+
+
+def unpack_frog_table(frog_table, palette=None):
+    """Convert the bitset frog table back into a (base, secondary) boolean grid"""
+    palette = default_palette() if palette is None else palette
+    bits = np.arange(64, dtype=np.uint64)
+    frog_grid = ((frog_table[:, :, None] >> bits) & np.uint64(1)).astype(bool)
+    return frog_grid.reshape(len(frog_table), -1)[:, :len(palette.secondary_colors)]
+
+
+def validation_stride(validate):
+    """Completion check stride of a validation mode"""
+    if validate not in VALIDATION_STRIDES:
+        raise ValueError(f"Unknown validation mode {validate!r}, modes: {', '.join(VALIDATION_STRIDES)}")
+    return VALIDATION_STRIDES[validate]
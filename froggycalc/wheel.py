@@ -0,0 +1,124 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from froggycalc.numba_engine import PAIR_COUNT_RULES, score_wheels, warm_up
+from froggycalc.palette import load_palette
+
+
+def neighbor(order, rng):
+    """Propose a new ordering by swapping two frogs or moving one frog to another position"""
+    order = order.copy()
+    i, j = rng.choice(len(order), size=2, replace=False)
+    if rng.random() < 0.5:
+        order[i], order[j] = order[j], order[i]
+    else:
+        order = np.insert(np.delete(order, i), j, order[i])
+    return order
+
+
+def simulated_scorer(strategy, trials, seed, palette):
+    """Score orderings of a palette's color wheel by their mean breeds over common random numbers, all
+    candidates in one parallel call
+    """
+    def score(orders):
+        wheels = palette.color_wheel_indices[np.array(orders)]
+        return score_wheels(strategy, wheels, trials, seed, palette=palette).mean(axis=1)
+    return score
+
+
+def exact_scorer(strategy, palette):
+    """Score orderings of a palette's color wheel by their exact expected breeds"""
+    from froggycalc.exact import exact_breeds
+
+    def score(orders):
+        return np.array([float(exact_breeds(strategy, wheel=palette.color_wheel_indices[order], palette=palette).mean)
+                         for order in orders])
+    return score
+
+
+def optimize_wheel(score, n_frogs, iterations=200, candidates=64, temperature=2.0, seed=0):
+    """Simulated annealing over color wheel orderings
+
+    Each iteration scores a batch of neighbors of the current ordering together, moves to the best of them
+    when it is better (or, with a probability that shrinks as the temperature cools, when it is worse),
+    and returns the best ordering seen with its score.
+    """
+    rng = np.random.default_rng(seed)
+    current = np.arange(n_frogs)
+    current_score = score([current])[0]
+    best, best_score = current, current_score
+
+    for iteration in range(iterations):
+        proposals = [neighbor(current, rng) for _ in range(candidates)]
+        scores = score(proposals)
+        k = int(np.argmin(scores))
+
+        t = temperature * (1 - iteration / iterations)
+        if scores[k] < current_score or (t > 0 and rng.random() < np.exp((current_score - scores[k]) / t)):
+            current, current_score = proposals[k], scores[k]
+            if current_score < best_score:
+                best, best_score = current, current_score
+
+    return best, best_score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search for the color wheel ordering that needs the fewest breeds")
+    # Only the pair schedule strategies breed the wheel in order; greedy scores every ordering the same
+    parser.add_argument("--strategy", nargs="+", choices=list(PAIR_COUNT_RULES), default=["strategy_1", "strategy_2"])
+    parser.add_argument("--scorer", choices=["simulate", "exact"], default="simulate",
+                        help="score orderings with the simulation kernels, or exactly (pair schedule strategies only)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=64, help="neighbors scored together per iteration")
+    parser.add_argument("--trials", type=int, default=2000, help="common random number trials per candidate")
+    parser.add_argument("--temperature", type=float, default=2.0, help="initial annealing temperature, in breeds")
+    parser.add_argument("--check-trials", type=int, default=20000,
+                        help="fresh trials used to compare the best ordering against the default one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the best ordering per strategy to a JSON file")
+    parser.add_argument("--palette", metavar="PATH", help="palette JSON file (default: palettes/pocket_frogs.json)")
+    args = parser.parse_args(argv)
+    palette = load_palette(args.palette)
+    color_wheel = palette.color_wheel
+
+    warm_up(args.strategy, cases=args.scorer == "simulate")
+    best_orders = {}
+    for strategy in args.strategy:
+        if args.scorer == "exact":
+            from froggycalc.numpy_engine import COUNT_RULES
+            if strategy not in COUNT_RULES:
+                parser.error(f"{strategy!r} has no exact scorer")
+            score = exact_scorer(strategy, palette)
+        else:
+            score = simulated_scorer(strategy, args.trials, args.seed, palette)
+
+        print(f"\nOptimizing the color wheel order for {strategy.replace('_', ' ')}")
+        start_time = time.time()
+        best, best_score = optimize_wheel(score, len(color_wheel), args.iterations, args.candidates,
+                                          args.temperature, args.seed)
+        elapsed = time.time() - start_time
+        evaluated = 1 + args.iterations * args.candidates
+        print(f"Evaluated {evaluated} orderings in {elapsed:.2f} seconds ({evaluated / elapsed:.0f} orderings/sec)")
+
+        # Compare against the default order on random streams the search never saw
+        default = np.arange(len(color_wheel))
+        check = score_wheels(strategy, palette.color_wheel_indices[np.array([default, best])], args.check_trials,
+                             seed=args.seed + 2 ** 30, palette=palette)
+        difference = check[1] - check[0]
+        half_width = 1.96 * difference.std(ddof=1) / np.sqrt(len(difference))
+        print(f"Default order: {check[0].mean():.2f} breeds, best order: {check[1].mean():.2f} breeds "
+              f"(difference {difference.mean():+.2f} +/- {half_width:.2f})")
+
+        best_orders[strategy] = [list(color_wheel[k]) for k in best]
+        print("Best order: " + ", ".join(" ".join(frog) for frog in best_orders[strategy]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(best_orders, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()